@@ -0,0 +1,85 @@
+"""Benchmark every day's parts and compare them against a recorded baseline.
+
+    python bench.py --save            # record a new baseline
+    python bench.py                   # compare against it
+    python bench.py -n 10 -t 0.2 8 9  # 10 repeats, flag >20% slowdowns, days 8 and 9
+    python bench.py --size 1000 8     # a generated 1000x1000 forest instead of data/
+
+A part is flagged when its median wall time is more than the threshold
+slower than the baseline median. The exit code is 1 if anything regressed.
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import median
+import json
+import sys
+
+from generate import generate
+from run import DAYS, load_day, time_call
+
+BASELINE = Path(__file__).parent / "bench_baseline.json"
+
+Results = dict[str, dict[str, float]]
+
+
+def bench_day(day: int, repeat=5, size: int | None = None, seed=0) -> Results:
+    module = load_day(day)
+    raw = module.file.read_text() if size is None else generate(day, size, seed=seed)
+    suffix = "" if size is None else f"@{size}s{seed}"
+    results: Results = {}
+    for part, func in ((1, module.part1), (2, module.part2)):
+        timings = [time_call(func, raw)[1] for _ in range(repeat)]
+        results[f"{day}.{part}{suffix}"] = {"min": min(timings), "median": median(timings)}
+    return results
+
+
+def bench(days: list[int], repeat=5, size: int | None = None, seed=0) -> Results:
+    results: Results = {}
+    for day in days:
+        day_results = bench_day(day, repeat=repeat, size=size, seed=seed)
+        for key, timing in day_results.items():
+            print(f"{key:>12}  min {timing['min']:10.4f}s  median {timing['median']:10.4f}s", flush=True)
+        results.update(day_results)
+    return results
+
+
+def regressions(results: Results, baseline: Results, threshold=0.1):
+    for key, timing in results.items():
+        if key not in baseline:
+            continue
+        old = baseline[key]["median"]
+        new = timing["median"]
+        if new > old * (1 + threshold):
+            yield key, old, new
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("-t", "--threshold", type=float, default=0.1)
+    parser.add_argument("-b", "--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--size", type=int, default=None, help="benchmark a generated input of this size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = bench(args.days, repeat=args.repeat, size=args.size, seed=args.seed)
+    if args.save:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --save first")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    slower = list(regressions(results, baseline, threshold=args.threshold))
+    for key, old, new in slower:
+        print(f"REGRESSION {key}: median {old:.4f}s -> {new:.4f}s (+{(new / old - 1) * 100:.0f}%)")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,44 @@
+from heapq import nlargest
 from pathlib import Path
+from typing import Iterable
+
+from stream import read_lines
+
 file = Path(__file__).parent.parent / 'data' / 'day1.txt'
-x = sorted(
-    [sum(map(int, x.split())) for x in file.read_text().split('\n\n')],
-    reverse=True
-)
-print(x[0])
-print(sum(x[:3]))
+
+
+def elf_totals(lines: Iterable[str]):
+    total = 0
+    for line in lines:
+        if line.strip():
+            total += int(line)
+        else:
+            yield total
+            total = 0
+    yield total
+
+
+def top_totals(lines: Iterable[str], k=3):
+    return nlargest(k, elf_totals(lines))
+
+
+def part1(raw: str):
+    return top_totals(raw.splitlines(), k=1)[0]
+
+
+def part2(raw: str):
+    return sum(top_totals(raw.splitlines()))
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+def solve_stream(path: Path | str = file, k=3):
+    top = top_totals(read_lines(path), k=k)
+    return top[0], sum(top)
+
+
+if __name__ == '__main__':
+    for answer in solve(file.read_text()):
+        print(answer)
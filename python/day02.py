@@ -1,7 +1,9 @@
 from pathlib import Path
+from typing import Iterable
+
+from stream import read_lines
 
 file = Path(__file__).parent.parent / "data" / "day2.txt"
-raw = file.read_text().strip()
 
 choices: dict[str, int] = {
     "A": 0, "X": 0,
@@ -9,15 +11,46 @@ choices: dict[str, int] = {
     "C": 2, "Z": 2,
 }
 
-Data = list[tuple[int, int]]
-x: Data = [tuple(map(choices.__getitem__, x.split())) for x in raw.splitlines()]
+Data = Iterable[tuple[int, int]]
+
+
+def parse(lines: Iterable[str]) -> Data:
+    for line in lines:
+        if line.strip():
+            a, b = line.split()
+            yield choices[a], choices[b]
+
+
+def round_score(a: int, b: int, alt=False):
+    if alt: b = (a + (b + 2) % 3) % 3
+    return (3 * (1 + (b - a) % 3)) % 9 + b + 1
 
 
 def get_score(data: Data, alt=False):
     for a, b in data:
-        if alt: b = (a + (b + 2) % 3) % 3
-        yield (3 * (1 + (b - a) % 3)) % 9 + b + 1
+        yield round_score(a, b, alt)
+
+
+def part1(raw: str):
+    return sum(get_score(parse(raw.splitlines())))
+
+
+def part2(raw: str):
+    return sum(get_score(parse(raw.splitlines()), True))
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+def solve_stream(path: Path | str = file):
+    score = alt_score = 0
+    for a, b in parse(read_lines(path)):
+        score += round_score(a, b)
+        alt_score += round_score(a, b, True)
+    return score, alt_score
 
 
-print(sum(get_score(x)))
-print(sum(get_score(x, True)))
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
@@ -1,12 +1,83 @@
+from functools import reduce
+from itertools import islice
+from operator import and_
 from pathlib import Path
 from string import ascii_letters
+from typing import Iterable, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 file = Path(__file__).parent.parent / "data" / "day3.txt"
-raw = file.read_text().strip()
-data = [x for x in raw.splitlines()]
 
-def score(args):
-    return ascii_letters.index(set.intersection(*map(set, args)).pop()) + 1
+# the item with priority p is bit p - 1, so a lone common item's priority is the mask's bit length
+BITS = {ch: 1 << i for i, ch in enumerate(ascii_letters)}
+BATCH_SIZE = 100_000
+
+
+def parse(raw: str):
+    return [x for x in raw.strip().splitlines()]
+
+def mask(items: Iterable[str]) -> int:
+    return sum(map(BITS.__getitem__, set(items)))
+
+def priority(mask: int) -> int:
+    return mask.bit_length()
+
+def score(args: Iterable[str]):
+    return priority(reduce(and_, map(mask, args)))
+
+def compartments(line: str, count=2):
+    size = len(line) // count
+    return [line[i:i+size] for i in range(0, size * count, size)]
+
+def groups(lines: Iterable[str], size=3):
+    it = iter(lines)
+    while group := list(islice(it, size)):
+        yield group
+
+def batch_masks(items: Sequence[str]):
+    assert np is not None
+    table = np.zeros(256, dtype=np.uint64)
+    for ch, bit in BITS.items():
+        table[ord(ch)] = bit
+    masks = []
+    for i in range(0, len(items), BATCH_SIZE):
+        chunk = items[i:i+BATCH_SIZE]
+        width = max(map(len, chunk))
+        data = ''.join(x.ljust(width) for x in chunk).encode()
+        chars = np.frombuffer(data, dtype=np.uint8).reshape(len(chunk), width)
+        masks.append(np.bitwise_or.reduce(table[chars], axis=1))
+    return np.concatenate(masks)
+
+def batch_score(groups: Iterable[Sequence[str]], size: int):
+    if np is None:
+        return sum(map(score, groups))
+    # a short trailing group is scored on its own, as the fallback would
+    items: list[str] = []
+    short = 0
+    for group in groups:
+        if len(group) == size:
+            items.extend(group)
+        else:
+            short += score(group)
+    if not items:
+        return short
+    common = np.bitwise_and.reduce(batch_masks(items).reshape(-1, size), axis=1)
+    return int(np.log2(common).astype(np.int64).sum()) + len(common) + short
+
+def part1(raw: str):
+    return batch_score(map(compartments, parse(raw)), 2)
+
+def part2(raw: str):
+    return batch_score(groups(parse(raw), 3), 3)
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
 
-print(sum(score([x[:len(x)//2], x[len(x)//2:]]) for x in data))
-print(sum(score(data[i:i+3]) for i in range(0, len(data), 3)))
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
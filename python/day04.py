@@ -1,19 +1,145 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from math import inf
 from pathlib import Path
+from typing import Iterable
 import re
 
+from stream import read_lines
+
 file = Path(__file__).parent.parent / "data" / "day4.txt"
-raw = file.read_text().strip()
-
-count = 0
-count2 = 0
-for x in re.findall(r'(\d+)-(\d+),(\d+)-(\d+)', raw):
-    a, b, c, d = map(int, x)
-    s1 = set(range(a, b + 1))
-    s2 = set(range(c, d + 1))
-    if len(s1.union(s2)) == max(len(s1), len(s2)):
-        count += 1
-    if len(s1 & s2) > 0:
-        count2 += 1
-
-print(count)
-print(count2)
+
+PAIR = re.compile(r'(\d+)-(\d+),(\d+)-(\d+)')
+
+Pair = tuple[int, int, int, int]
+
+
+def parse(lines: Iterable[str]) -> Iterable[Pair]:
+    for line in lines:
+        if match := PAIR.search(line):
+            a, b, c, d = map(int, match.groups())
+            yield a, b, c, d
+
+
+def check(a: int, b: int, c: int, d: int):
+    contained = (a <= c and d <= b) or (c <= a and b <= d)
+    overlapping = a <= d and c <= b
+    return contained, overlapping
+
+
+def count_pairs(pairs: Iterable[Pair]):
+    count = 0
+    count2 = 0
+    for pair in pairs:
+        contained, overlapping = check(*pair)
+        if contained:
+            count += 1
+        if overlapping:
+            count2 += 1
+    return count, count2
+
+
+@dataclass
+class IntervalIndex:
+    intervals: list[tuple[int, int, int]]
+
+    def __post_init__(self):
+        self.intervals.sort()
+        self.starts = [start for start, _, _ in self.intervals]
+        self.ends = [end for _, end, _ in self.intervals]
+        self.sorted_ends = sorted(self.ends)
+        self.start_sums = list(accumulate(self.starts, initial=0))
+        self.end_sums = list(accumulate(self.sorted_ends, initial=0))
+        # max end of each implicit subtree of the start-sorted array, stored at its midpoint
+        self.max_end = [0] * len(self.intervals)
+        self.build_max_end(0, len(self.intervals))
+
+    def build_max_end(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return -inf
+        mid = (lo + hi) // 2
+        self.max_end[mid] = max(
+            self.ends[mid],
+            self.build_max_end(lo, mid),
+            self.build_max_end(mid + 1, hi),
+        )
+        return self.max_end[mid]
+
+    def count_covering(self, x: int):
+        return bisect_right(self.starts, x) - bisect_left(self.sorted_ends, x)
+
+    def covering(self, x: int):
+        limit = bisect_right(self.starts, x)
+        found = []
+        stack = [(0, len(self.intervals))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi or lo >= limit:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_end[mid] < x:
+                continue
+            if mid < limit and self.ends[mid] >= x:
+                found.append(self.intervals[mid])
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+        return found
+
+    def covered_up_to(self, x: int):
+        k = bisect_right(self.starts, x)
+        j = bisect_left(self.sorted_ends, x)
+        return (k * (x + 1) - self.start_sums[k]) - (j * x - self.end_sums[j])
+
+    def coverage(self, lo: int, hi: int):
+        if hi < lo:
+            return 0
+        return self.covered_up_to(hi) - self.covered_up_to(lo - 1)
+
+
+@dataclass
+class Assignments:
+    pairs: list[Pair]
+
+    def __post_init__(self):
+        self.sections = IntervalIndex([
+            interval
+            for i, (a, b, c, d) in enumerate(self.pairs)
+            for interval in ((a, b, i), (c, d, i))
+        ])
+        self.overlaps = IntervalIndex([
+            (max(a, c), min(b, d), i)
+            for i, (a, b, c, d) in enumerate(self.pairs)
+            if check(a, b, c, d)[1]
+        ])
+
+    def pairs_covering(self, section: int):
+        return sorted({i for _, _, i in self.sections.covering(section)})
+
+    def total_overlap(self, lo: int | None = None, hi: int | None = None):
+        if not self.overlaps.intervals:
+            return 0
+        lo = self.overlaps.starts[0] if lo is None else lo
+        hi = self.overlaps.sorted_ends[-1] if hi is None else hi
+        return self.overlaps.coverage(lo, hi)
+
+
+def part1(raw: str):
+    return count_pairs(parse(raw.splitlines()))[0]
+
+
+def part2(raw: str):
+    return count_pairs(parse(raw.splitlines()))[1]
+
+
+def solve(raw: str):
+    return count_pairs(parse(raw.splitlines()))
+
+
+def solve_stream(path: Path | str = file):
+    return count_pairs(parse(read_lines(path)))
+
+
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
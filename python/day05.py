@@ -1,28 +1,161 @@
+from array import array
 from pathlib import Path
+from random import Random
 import re
 
 file = Path(__file__).parent.parent / "data" / "day5.txt"
-raw = file.read_text()
 
-CRATE_STRING, ARRANGEMENT = raw.split('\n\n')
-LINES = CRATE_STRING.splitlines()
+NIL = 0
 
-def get_crates():
-    for idx in range(1, len(LINES[-1]), 4):
-        yield [x[idx] for x in LINES[:-1] if x[idx].strip()][::-1]
 
-def get_instructions():
-    for data in re.findall(r"move (\d+) from (\d+) to (\d+)", ARRANGEMENT):
+def split_input(raw: str):
+    crate_string, arrangement = raw.split('\n\n')
+    return crate_string.splitlines(), arrangement
+
+def get_crates(lines: list[str]):
+    for idx in range(1, len(lines[-1]), 4):
+        yield [x[idx] for x in lines[:-1] if x[idx].strip()][::-1]
+
+def get_instructions(arrangement: str):
+    # flat (count, start, end) triples, parsed once
+    instructions = array('I')
+    for data in re.findall(r"move (\d+) from (\d+) to (\d+)", arrangement):
         count, start, end = map(int, data)
-        yield count, start-1, end-1
+        instructions.extend((count, start-1, end-1))
+    return instructions
+
+def iter_instructions(instructions: array):
+    it = iter(instructions)
+    return zip(it, it, it)
+
+
+class Stacks:
+    # every stack is an implicit treap over shared node arrays, with a lazy
+    # reversal flag, so moving k crates is one split and one merge in O(log n)
+    def __init__(self, crates: list[list[str]], seed=0):
+        self.random = Random(seed)
+        self.value = ['']
+        self.priority = [0.0]
+        self.left = [NIL]
+        self.right = [NIL]
+        self.size = [0]
+        self.reversed = bytearray(1)
+        self.roots = []
+        for stack in crates:
+            root = NIL
+            for crate in stack:
+                root = self.merge(root, self.node(crate))
+            self.roots.append(root)
+
+    def node(self, value: str):
+        self.value.append(value)
+        self.priority.append(self.random.random())
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.size.append(1)
+        self.reversed.append(0)
+        return len(self.value) - 1
+
+    def push(self, t: int):
+        if self.reversed[t]:
+            left, right = self.right[t], self.left[t]
+            self.left[t], self.right[t] = left, right
+            self.reversed[left] ^= 1
+            self.reversed[right] ^= 1
+            self.reversed[t] = 0
+            self.reversed[NIL] = 0
+
+    def update(self, t: int):
+        self.size[t] = self.size[self.left[t]] + self.size[self.right[t]] + 1
+
+    def merge(self, a: int, b: int) -> int:
+        if a == NIL or b == NIL:
+            return a or b
+        if self.priority[a] > self.priority[b]:
+            self.push(a)
+            self.right[a] = self.merge(self.right[a], b)
+            self.update(a)
+            return a
+        self.push(b)
+        self.left[b] = self.merge(a, self.left[b])
+        self.update(b)
+        return b
+
+    def split(self, t: int, k: int) -> tuple[int, int]:
+        if t == NIL:
+            return NIL, NIL
+        self.push(t)
+        left_size = self.size[self.left[t]]
+        if k <= left_size:
+            a, b = self.split(self.left[t], k)
+            self.left[t] = b
+            self.update(t)
+            return a, t
+        a, b = self.split(self.right[t], k - left_size - 1)
+        self.right[t] = a
+        self.update(t)
+        return t, b
+
+    def move(self, count: int, start: int, end: int, group=False):
+        rest, piece = self.split(self.roots[start], self.size[self.roots[start]] - count)
+        if not group:
+            self.reversed[piece] ^= 1
+        self.roots[start] = rest
+        self.roots[end] = self.merge(self.roots[end], piece)
+
+    def top(self, stack: int):
+        t = self.roots[stack]
+        while True:
+            self.push(t)
+            if self.right[t] == NIL:
+                return self.value[t]
+            t = self.right[t]
+
+    def tops(self):
+        return "".join(self.top(i) for i in range(len(self.roots)))
+
+
+def move(crates: list[list[str]], instructions: array, group=False):
+    stacks = Stacks(crates)
+    for count, start, end in iter_instructions(instructions):
+        stacks.move(count, start, end, group)
+    return stacks.tops()
+
+def final_tops(crates: list[list[str]], instructions: array, group=False):
+    # trace each final top backwards to the crate it started as, O(instructions * stacks)
+    heights = [len(x) for x in crates]
+    for count, start, end in iter_instructions(instructions):
+        heights[start] -= count
+        heights[end] += count
+    stacks = [i for i, h in enumerate(heights) if h]
+    positions = [heights[i] - 1 for i in stacks]
+    tracked = range(len(stacks))
+    for i in range(len(instructions) - 3, -1, -3):
+        count, start, end = instructions[i], instructions[i + 1], instructions[i + 2]
+        heights[start] += count
+        heights[end] -= count
+        for j in tracked:
+            if stacks[j] == end and positions[j] >= heights[end]:
+                offset = positions[j] - heights[end]
+                stacks[j] = start
+                if group:
+                    positions[j] = heights[start] - count + offset
+                else:
+                    positions[j] = heights[start] - 1 - offset
+    return "".join(crates[s][i] for s, i in zip(stacks, positions))
+
+def part1(raw: str):
+    lines, arrangement = split_input(raw)
+    return final_tops(list(get_crates(lines)), get_instructions(arrangement))
+
+def part2(raw: str):
+    lines, arrangement = split_input(raw)
+    return final_tops(list(get_crates(lines)), get_instructions(arrangement), True)
 
-def move(crates: list[list[str]], group=False):
-    for count, start, end in get_instructions():
-        piece = crates[start][-count:] if group else crates[start][-count:][::-1]
-        crates[end].extend(piece)
-        del crates[start][-count:]
-    return "".join(x[-1] for x in crates)
+def solve(raw: str):
+    return part1(raw), part2(raw)
 
 
-print(move(list(get_crates())))
-print(move(list(get_crates()), True))
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
@@ -1,13 +1,61 @@
 from pathlib import Path
+from typing import BinaryIO, Iterable
+import sys
+
+from stream import read_chunks
 
 file = Path(__file__).parent.parent / "data" / "day6.txt"
-raw = file.read_text().strip()
 
-def find_start(count: int):
-    for i in range(len(raw)):
-        x = set(raw[i:i+count])
-        if len(x) == count:
-            return i + count
+WHITESPACE = frozenset(b' \t\r\n')
+
+
+def find_markers(chunks: Iterable[bytes], sizes: Iterable[int] = (4, 14)):
+    # the run of distinct bytes ending at the current one starts just after the
+    # last repeat of any byte in it, so every byte is O(1) however many sizes
+    # are asked for and only a last-seen position per byte value is kept
+    pending = sorted(set(sizes), reverse=True)
+    last = [-1] * 256
+    run_start = 0
+    found: dict[int, int] = {}
+    n = 0
+    for chunk in chunks:
+        for ch in chunk:
+            if ch in WHITESPACE:
+                continue
+            if last[ch] >= run_start:
+                run_start = last[ch] + 1
+            last[ch] = n
+            n += 1
+            # the run grows by at most one byte, so it reaches each size exactly
+            while pending and n - run_start >= pending[-1]:
+                found[pending.pop()] = n
+            if not pending:
+                return found
+    return found
+
+def find_start(raw: str, count: int):
+    return find_markers([raw.encode()], (count,)).get(count)
+
+def part1(raw: str):
+    return find_start(raw.strip(), 4)
+
+def part2(raw: str):
+    return find_start(raw.strip(), 14)
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+def solve_stream(source: Path | str | BinaryIO = file, sizes: Iterable[int] = (4, 14)):
+    return find_markers(read_chunks(source), sizes)
+
 
-print(f'part 1: {find_start(4)}')
-print(f'part 1: {find_start(14)}')
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # python day06.py <file or -> [window sizes...]
+        source = sys.stdin.buffer if sys.argv[1] == '-' else sys.argv[1]
+        for size, position in sorted(solve_stream(source, [int(x) for x in sys.argv[2:]] or [4, 14]).items()):
+            print(f'{size}: {position}')
+    else:
+        raw = file.read_text()
+        print(f'part 1: {part1(raw)}')
+        print(f'part 2: {part2(raw)}')
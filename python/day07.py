@@ -1,24 +1,33 @@
-from functools import cached_property
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 from dataclasses import dataclass, field
+import os
+import sqlite3
+import sys
+import tempfile
+
+from stream import read_lines
 
 file = Path(__file__).parent.parent / "data" / "day7.txt"
-raw = file.read_text().strip()
+TOTAL_SPACE = 70000000
+NEEDED_SPACE = 30000000
 
 
-@dataclass
+@dataclass(slots=True)
 class File:
     name: str
     size: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Folder:
     name: str
-    folders: list['Folder'] = field(default_factory=list)
+    folders: dict[str, 'Folder'] = field(default_factory=dict)
     files: list[File] = field(default_factory=list)
     parent: Optional['Folder'] = None
+    size: int = 0
 
     def __hash__(self):
         return id(self)
@@ -26,25 +35,52 @@ class Folder:
     def cd(self, name: str):
         if name == "..":
             return self.parent or self
-        for folder in self.folders:
-            if folder.name == name:
-                return folder
-        folder = Folder(name=name, parent=self)
-        self.folders.append(folder)
+        folder = self.folders.get(name)
+        if folder is None:
+            folder = self.folders[name] = Folder(name=name, parent=self)
         return folder
 
-    @cached_property
-    def size(self) -> int:
-        return sum(x.size for x in self.files + self.folders)
-
     def traverse_folders(self):
-        for folder in self.folders:
-            yield from folder.traverse_folders()
-        yield self
+        # post-order, children before their parent, without recursion
+        stack: list[tuple[Folder, bool]] = [(self, False)]
+        while stack:
+            folder, expanded = stack.pop()
+            if expanded:
+                yield folder
+                continue
+            stack.append((folder, True))
+            stack.extend((child, False) for child in folder.folders.values())
 
+    def compute_sizes(self):
+        for folder in self.traverse_folders():
+            folder.size = sum(x.size for x in folder.files) + sum(x.size for x in folder.folders.values())
+        return self.size
 
-def parse_output(data: str):
-    lines = data.strip().splitlines()
+
+@dataclass
+class SizeIndex:
+    sizes: list[int]
+
+    def __post_init__(self):
+        self.sizes.sort()
+        self.sums = list(accumulate(self.sizes, initial=0))
+
+    @classmethod
+    def build(cls, root: Folder):
+        return cls([x.size for x in root.traverse_folders()])
+
+    def sum_at_most(self, threshold: int):
+        return self.sums[bisect_right(self.sizes, threshold)]
+
+    def count_at_least(self, threshold: int):
+        return len(self.sizes) - bisect_left(self.sizes, threshold)
+
+    def smallest_at_least(self, threshold: int):
+        i = bisect_left(self.sizes, threshold)
+        return self.sizes[i] if i < len(self.sizes) else None
+
+
+def parse_lines(lines: Iterable[str]):
     root = Folder(name="/")
     cwd = root
     for line in lines:
@@ -52,19 +88,178 @@ def parse_output(data: str):
             case ["$", "cd", name]:
                 cwd = root if name == "/" else cwd.cd(name)
             case ['dir', b]:
-                cwd.folders.append(Folder(name=b, parent=cwd))
+                if b not in cwd.folders:
+                    cwd.folders[b] = Folder(name=b, parent=cwd)
             case [size, name] if size.isdigit():
                 cwd.files.append(File(name=name, size=int(size)))
+    root.compute_sizes()
     return root
 
 
-if __name__ == "__main__":
+def parse_output(data: str):
+    return parse_lines(data.strip().splitlines())
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    id INTEGER PRIMARY KEY,
+    parent INTEGER,
+    name TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    own INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (parent, name)
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS folders_depth ON folders (depth);
+CREATE INDEX IF NOT EXISTS folders_size ON folders (size);
+"""
+
+
+@dataclass
+class DiskTree:
+    """The folder tree kept in sqlite instead of as Folder objects.
+
+    Only the ids of the current path and the file total of the current
+    folder are held in memory while parsing; sizes are rolled up one depth
+    level at a time with bulk updates. Without a path the table goes to a
+    temporary file that is removed on close; pass ":memory:" to keep it in RAM.
+    """
+    db: sqlite3.Connection
+    root: int
+    temp: Optional[Path] = None
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], path: Path | str | None = None, batch=100000):
+        temp = None
+        if path is None:
+            fd, name = tempfile.mkstemp(prefix="day07-", suffix=".sqlite")
+            os.close(fd)
+            path = temp = Path(name)
+        db = sqlite3.connect(path)
+        db.executescript(SCHEMA)
+        db.execute("DELETE FROM folders")
+        root = db.execute("INSERT INTO folders (parent, name, depth) VALUES (NULL, '/', 0)").lastrowid
+        assert root is not None
+        tree = cls(db, root, temp)
+        try:
+            tree.load(lines, batch)
+        except BaseException:
+            tree.close()
+            raise
+        return tree
+
+    def load(self, lines: Iterable[str], batch: int):
+        path_ids = [self.root]
+        own = 0
+        for n, line in enumerate(lines):
+            match line.split():
+                case ["$", "cd", name]:
+                    self.add_own(path_ids[-1], own)
+                    own = 0
+                    if name == "/":
+                        del path_ids[1:]
+                    elif name == "..":
+                        if len(path_ids) > 1:
+                            path_ids.pop()
+                    else:
+                        path_ids.append(self.child(path_ids[-1], name, len(path_ids)))
+                case ["dir", name]:
+                    self.child(path_ids[-1], name, len(path_ids))
+                case [size, _] if size.isdigit():
+                    own += int(size)
+            if n % batch == 0:
+                self.db.commit()
+        self.add_own(path_ids[-1], own)
+        self.compute_sizes()
+
+    @classmethod
+    def parse_file(cls, source: Path | str, path: Path | str | None = None):
+        return cls.parse(read_lines(source), path)
+
+    def child(self, parent: int, name: str, depth: int) -> int:
+        row = self.db.execute(
+            "SELECT id FROM folders WHERE parent = ? AND name = ?", (parent, name)
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        return self.db.execute(
+            "INSERT INTO folders (parent, name, depth) VALUES (?, ?, ?)", (parent, name, depth)
+        ).lastrowid  # type: ignore
+
+    def add_own(self, folder: int, size: int):
+        if size:
+            self.db.execute("UPDATE folders SET own = own + ? WHERE id = ?", (size, folder))
+
+    def compute_sizes(self):
+        db = self.db
+        db.executescript(INDEXES)
+        db.execute("UPDATE folders SET size = own")
+        (max_depth,) = db.execute("SELECT MAX(depth) FROM folders").fetchone()
+        # children are complete before their parents are summed
+        for depth in range(max_depth, 0, -1):
+            db.execute("""
+                UPDATE folders SET size = folders.size + totals.total
+                FROM (
+                    SELECT parent, SUM(size) AS total FROM folders
+                    WHERE depth = ? GROUP BY parent
+                ) AS totals
+                WHERE folders.id = totals.parent
+            """, (depth,))
+        db.commit()
+        return self.size
+
+    @property
+    def size(self) -> int:
+        return self.db.execute("SELECT size FROM folders WHERE id = ?", (self.root,)).fetchone()[0]
+
+    def sum_at_most(self, threshold: int):
+        return self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM folders WHERE size <= ?", (threshold,)
+        ).fetchone()[0]
+
+    def count_at_least(self, threshold: int):
+        return self.db.execute("SELECT COUNT(*) FROM folders WHERE size >= ?", (threshold,)).fetchone()[0]
+
+    def smallest_at_least(self, threshold: int):
+        return self.db.execute("SELECT MIN(size) FROM folders WHERE size >= ?", (threshold,)).fetchone()[0]
+
+    def close(self):
+        self.db.close()
+        if self.temp is not None:
+            self.temp.unlink(missing_ok=True)
+            self.temp = None
+
+
+def part1(raw: str):
+    index = SizeIndex.build(parse_output(raw))
+    return index.sum_at_most(100000)
+
+
+def part2(raw: str):
     root = parse_output(raw)
-    print(sum(x.size for x in root.traverse_folders() if x.size <= 100000))
-
-    MIN_DELETE = root.size - (70000000 - 30000000)
-    item = min(
-        (x for x in root.traverse_folders() if x.size >= MIN_DELETE),
-        key=lambda x: x.size,
-    )
-    print(item.size)
+    index = SizeIndex.build(root)
+    return index.smallest_at_least(root.size - (TOTAL_SPACE - NEEDED_SPACE))
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+def solve_disk(source: Path | str = file, path: Path | str | None = None):
+    tree = DiskTree.parse_file(source, path)
+    try:
+        return tree.sum_at_most(100000), tree.smallest_at_least(tree.size - (TOTAL_SPACE - NEEDED_SPACE))
+    finally:
+        tree.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # python day07.py <log file> [database file, or :memory:]
+        for answer in solve_disk(*sys.argv[1:3]):
+            print(answer)
+    else:
+        for answer in solve(file.read_text()):
+            print(answer)
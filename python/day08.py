@@ -1,84 +1,213 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
+from heapq import heapify, heappop, heappush
+from math import prod
 from pathlib import Path
-from typing import Self
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from grid import Grid
 
 file = Path(__file__).parent.parent / "data" / "day8.txt"
-raw = file.read_text().strip()
 
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+HEIGHTS = 10
 
-@dataclass
-class Tree:
-    value: int
-    up: Self | None = None
-    down: Self | None = None
-    left: Self | None = None
-    right: Self | None = None
-
-    def __repr__(self):
-        return f"{self.value}"
-
-    @property
-    def surroundings(self):
-        dirs: dict[str, list[Tree]] = {
-            "up": [],
-            "down": [],
-            "left": [],
-            "right": [],
-        }
-        for direction in dirs.keys():
-            node: Tree = self
-            while node := getattr(node, direction):
-                dirs[direction].append(node)
-        return dirs
-
-    def is_visible(self):
-        for items in self.surroundings.values():
-            if len([x for x in items if x.value >= self.value]) == 0:
-                return True
-        return False
-
-    def score(self):
-        score = 1
-        for trees in self.surroundings.values():
-            if not trees:
-                return 0
-            i = None
-            found = False
-            for i, tree in enumerate(trees, 1):
-                if tree.value >= self.value:
-                    score *= i
-                    found = True
-                    break
-            if not found and i:
-                score *= i
-        return score
+
+def sweep(cells: bytearray, line: range, dist: list[int], clear: bytearray):
+    # looking back along `line`: the first tree at least as tall blocks the view,
+    # and the stack only ever holds trees that could still block a later one
+    stack: list[tuple[int, int]] = []
+    for n, i in enumerate(line):
+        height = cells[i]
+        while stack and stack[-1][0] < height:
+            stack.pop()
+        if stack:
+            dist[i] = n - stack[-1][1]
+            clear[i] = 0
+        else:
+            dist[i] = n
+            clear[i] = 1
+        stack.append((height, n))
 
 
+def np_sweep(heights):
+    # the same as `sweep` for every row at once, looking towards column 0
+    columns = np.arange(heights.shape[1])
+    dist = np.broadcast_to(columns, heights.shape).copy()
+    clear = np.ones(heights.shape, dtype=bool)
+    for height in range(HEIGHTS):
+        last = np.maximum.accumulate(np.where(heights >= height, columns, -1), axis=1)
+        blocker = np.full_like(last, -1)
+        blocker[:, 1:] = last[:, :-1]
+        blocked = (heights == height) & (blocker >= 0)
+        np.copyto(dist, columns - blocker, where=blocked)
+        clear &= ~blocked
+    return dist, clear
+
+
+@dataclass
 class Forest:
-    def __init__(self, data: str):
-        self.map = self.parse(data)
-
-    def parse(self, data: str):
-        m: dict[tuple[int, int], Tree] = {}
-        for y, row in enumerate(data.splitlines()):
-            for x, ch in enumerate(row):
-                m[(x, y)] = Tree(value=int(ch))
-
-        for (x, y), tree in m.items():
-            tree.left = m.get((x - 1, y))
-            tree.right = m.get((x + 1, y))
-            tree.up = m.get((x, y - 1))
-            tree.down = m.get((x, y + 1))
-        return m
+    grid: Grid
+    # viewing distance and "can see the edge" per direction: west, east, north, south
+    dist: list[list[int]] = field(default_factory=list)
+    clear: list[bytearray] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, data: str):
+        forest = cls(Grid.parse(data.strip(), border=0, pad=0, table=DIGITS))
+        if np is not None:
+            forest.np_sweep_all()
+        else:
+            forest.sweep_all()
+        return forest
+
+    def row(self, y: int):
+        width = self.grid.width
+        return range(y * width, (y + 1) * width)
+
+    def column(self, x: int):
+        return range(x, len(self.grid), self.grid.width)
+
+    def lines(self):
+        rows = [self.row(y) for y in range(self.grid.height)]
+        columns = [self.column(x) for x in range(self.grid.width)]
+        yield 0, rows
+        yield 1, [line[::-1] for line in rows]
+        yield 2, columns
+        yield 3, [line[::-1] for line in columns]
+
+    def sweep_all(self):
+        size = len(self.grid)
+        self.dist = [[0] * size for _ in range(4)]
+        self.clear = [bytearray(size) for _ in range(4)]
+        for direction, lines in self.lines():
+            for line in lines:
+                sweep(self.grid.cells, line, self.dist[direction], self.clear[direction])
+
+    def np_sweep_all(self):
+        assert np is not None
+        heights = np.frombuffer(bytes(self.grid.cells), dtype=np.uint8).reshape(self.grid.height, self.grid.width)
+        views = [
+            (heights, lambda a: a),
+            (heights[:, ::-1], lambda a: a[:, ::-1]),
+            (heights.T, lambda a: a.T),
+            (heights.T[:, ::-1], lambda a: a[:, ::-1].T),
+        ]
+        self.dist, self.clear = [], []
+        for view, restore in views:
+            dist, clear = np_sweep(view)
+            self.dist.append(restore(dist).ravel().tolist())
+            self.clear.append(bytearray(restore(clear).ravel().tobytes()))
+
+    def is_visible(self, i: int):
+        return any(clear[i] for clear in self.clear)
+
+    def score(self, i: int):
+        return prod(dist[i] for dist in self.dist)
 
     def count_visible(self):
-        return sum(x.is_visible() for x in self.map.values())
+        # the flags are 0/1 bytes, so or-ing them as big integers ors every tree at once
+        size = len(self.grid)
+        visible = 0
+        for clear in self.clear:
+            visible |= int.from_bytes(clear, "big")
+        return visible.to_bytes(size, "big").count(1)
 
     def scenic_scores(self):
-        return [x.score() for x in self.map.values() if x.is_visible()]
+        west, east, north, south = self.dist
+        return [
+            a * b * c * d
+            for a, b, c, d, *clear in zip(west, east, north, south, *self.clear)
+            if any(clear)
+        ]
+
+    # incremental updates: a height change only moves the views along its own
+    # row and column, so only those trees are re-swept and re-scored
+
+    @cached_property
+    def visible_count(self):
+        return self.count_visible()
+
+    @cached_property
+    def scores(self):
+        # hidden trees score 0 so they never win, matching scenic_scores
+        west, east, north, south = self.dist
+        return [
+            a * b * c * d if any(clear) else 0
+            for a, b, c, d, *clear in zip(west, east, north, south, *self.clear)
+        ]
+
+    @cached_property
+    def live(self):
+        # how many trees have a non-zero score, the heap's entries that matter
+        return len(self.scores) - self.scores.count(0)
+
+    @cached_property
+    def best(self):
+        # max-heap of (-score, index); entries go stale when a score changes
+        return self.build_heap()
+
+    def build_heap(self):
+        heap = [(-score, i) for i, score in enumerate(self.scores) if score]
+        heapify(heap)
+        return heap
+
+    def max_score(self):
+        heap, scores = self.best, self.scores
+        while heap and scores[heap[0][1]] != -heap[0][0]:
+            heappop(heap)
+        return -heap[0][0] if heap else 0
+
+    def set_height(self, x: int, y: int, height: int):
+        if not 0 <= height < HEIGHTS:
+            raise ValueError(f"tree height must be 0-9, got {height}")
+        i = self.grid.index(x, y)
+        if self.grid[i] == height:
+            return
+        visible_count, scores, heap, live = self.visible_count, self.scores, self.best, self.live
+        row, column = self.row(y), self.column(x)
+        affected = [*row, *(j for j in column if j != i)]
+        was_visible = [self.is_visible(j) for j in affected]
+
+        self.grid[i] = height
+        cells = self.grid.cells
+        sweep(cells, row, self.dist[0], self.clear[0])
+        sweep(cells, row[::-1], self.dist[1], self.clear[1])
+        sweep(cells, column, self.dist[2], self.clear[2])
+        sweep(cells, column[::-1], self.dist[3], self.clear[3])
+
+        for j, before in zip(affected, was_visible):
+            visible = self.is_visible(j)
+            visible_count += visible - before
+            score = self.score(j) if visible else 0
+            if score != scores[j]:
+                live += bool(score) - bool(scores[j])
+                scores[j] = score
+                if score:
+                    heappush(heap, (-score, j))
+        self.visible_count = visible_count
+        self.live = live
+        # stale entries only leave from the top, so rebuild before they pile up
+        if len(heap) > 2 * max(live, 1):
+            self.best = self.build_heap()
+
+
+def part1(raw: str):
+    return Forest.parse(raw).count_visible()
+
+
+def part2(raw: str):
+    return max(Forest.parse(raw).scenic_scores())
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
 
 
 if __name__ == "__main__":
-    forest = Forest(raw)
-    print(forest.count_visible())
-    print(max(forest.scenic_scores()))
+    for answer in solve(file.read_text()):
+        print(answer)
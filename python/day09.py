@@ -1,20 +1,148 @@
+from array import array
 from pathlib import Path
+from typing import Iterator
 
 file = Path(__file__).parent.parent / "data" / "day9.txt"
-raw = file.read_text().strip()
 
-DIR: dict[str, complex] = {
-    "U": -1j,
-    "D": 1j,
-    "R": 1,
-    "L": -1,
+DIR: dict[str, tuple[int, int]] = {
+    "U": (0, -1),
+    "D": (0, 1),
+    "R": (1, 0),
+    "L": (-1, 0),
 }
 
+
+def sign(n: int):
+    return (n > 0) - (n < 0)
+
+
+# after one head step a knot is never more than 2 away from the knot ahead,
+# so how it follows is a lookup on the 5x5 offsets, None when it stays put
+FOLLOW: list[tuple[int, int] | None] = [
+    (sign(dx), sign(dy)) if max(abs(dx), abs(dy)) == 2 else None
+    for dx in range(-2, 3)
+    for dy in range(-2, 3)
+]
+
+
+def offset(dx: int, dy: int):
+    # (dx + 2) * 5 + dy + 2, do_move inlines it
+    return dx * 5 + dy + 12
+
+
+TILE_BITS = 6
+TILE = 1 << TILE_BITS
+ROW_MASK = (1 << TILE) - 1
+
+
+class Visited:
+    """A set of visited cells kept as 64x64 bitmap tiles.
+
+    Each tile is TILE rows of one 64-bit word, keyed by its tile coordinate,
+    so memory grows with the area that was covered rather than with one
+    Python object per cell.
+    """
+
+    def __init__(self):
+        self.tiles: dict[tuple[int, int], array] = {}
+        self.count = 0
+
+    def tile(self, tx: int, ty: int):
+        tile = self.tiles.get((tx, ty))
+        if tile is None:
+            tile = self.tiles[(tx, ty)] = array('Q', bytes(8 * TILE))
+        return tile
+
+    def add(self, x: int, y: int):
+        tile = self.tile(x >> TILE_BITS, y >> TILE_BITS)
+        ly = y & (TILE - 1)
+        row = tile[ly]
+        bit = 1 << (x & (TILE - 1))
+        if not row & bit:
+            tile[ly] = row | bit
+            self.count += 1
+
+    def add_line(self, x: int, y: int, dx: int, dy: int, steps: int):
+        # cells (x + dx * k, y + dy * k) for k in 1..steps along an axis
+        if steps <= 0:
+            return
+        if dy:
+            lo, hi = (y + 1, y + steps) if dy > 0 else (y - steps, y - 1)
+            tx, bit = x >> TILE_BITS, 1 << (x & (TILE - 1))
+            while lo <= hi:
+                tile = self.tile(tx, lo >> TILE_BITS)
+                start = lo & (TILE - 1)
+                end = min(TILE - 1, start + hi - lo)
+                for ly in range(start, end + 1):
+                    row = tile[ly]
+                    if not row & bit:
+                        tile[ly] = row | bit
+                        self.count += 1
+                lo += end - start + 1
+            return
+        lo, hi = (x + 1, x + steps) if dx > 0 else (x - steps, x - 1)
+        ty, ly = y >> TILE_BITS, y & (TILE - 1)
+        while lo <= hi:
+            tile = self.tile(lo >> TILE_BITS, ty)
+            start = lo & (TILE - 1)
+            end = min(TILE - 1, start + hi - lo)
+            mask = (ROW_MASK >> (TILE - 1 - end + start)) << start
+            row = tile[ly]
+            self.count += (mask & ~row).bit_count()
+            tile[ly] = row | mask
+            lo += end - start + 1
+
+    def __contains__(self, point: tuple[int, int]):
+        x, y = point
+        tile = self.tiles.get((x >> TILE_BITS, y >> TILE_BITS))
+        return tile is not None and bool(tile[y & (TILE - 1)] >> (x & (TILE - 1)) & 1)
+
+    def __len__(self):
+        return self.count
+
+    def points(self) -> Iterator[tuple[int, int]]:
+        for (tx, ty), tile in self.tiles.items():
+            for ly, row in enumerate(tile):
+                while row:
+                    low = row & -row
+                    yield (tx << TILE_BITS) + low.bit_length() - 1, (ty << TILE_BITS) + ly
+                    row ^= low
+
+    def bounds(self):
+        xs, ys = [], []
+        for (tx, ty), tile in self.tiles.items():
+            rows = [ly for ly, row in enumerate(tile) if row]
+            if not rows:
+                continue
+            used = 0
+            for row in tile:
+                used |= row
+            xs += [(tx << TILE_BITS) + (used & -used).bit_length() - 1, (tx << TILE_BITS) + used.bit_length() - 1]
+            ys += [(ty << TILE_BITS) + rows[0], (ty << TILE_BITS) + rows[-1]]
+        if not xs:
+            return None
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def draw(self):
+        if (bounds := self.bounds()) is None:
+            return ""
+        min_x, min_y, max_x, max_y = bounds
+        return "\n".join(
+            "".join("#" if (x, y) in self else "." for x in range(min_x, max_x + 1))
+            for y in range(min_y, max_y + 1)
+        )
+
+
 class Rope:
     def __init__(self, instructions: str, length=2):
-        self.rope = [0j]*length
+        self.xs = [0] * length
+        self.ys = [0] * length
         self.instructions = list(self.parse(instructions))
-        self.l_history = set()
+        self.l_history = Visited()
+
+    @property
+    def rope(self):
+        return [complex(x, y) for x, y in zip(self.xs, self.ys)]
 
     def parse(self, data: str):
         for line in data.splitlines():
@@ -27,35 +155,73 @@ class Rope:
             self.do_move(direction, count)
 
     def do_move(self, direction: str, count: int):
-        for _ in range(count):
-            self.rope[0] += DIR[direction]
-            for i in range(len(self.rope)-1):
-                h, l = self.rope[i:i+2]
-                l = self.follow(h, l)
-                self.rope[i+1] = l
-            self.l_history.add(self.rope[-1])
+        if count <= 0:
+            return
+        dx, dy = DIR[direction]
+        xs, ys = self.xs, self.ys
+        history = self.l_history
+        if len(xs) > 1:
+            # a tail behind the head can't move on the first step, and
+            # every later stop was already recorded by the step before it
+            history.add(xs[-1], ys[-1])
+        follow = FOLLOW
+        last = len(xs) - 1
+        for step in range(count):
+            x = xs[0] = xs[0] + dx
+            y = ys[0] = ys[0] + dy
+            taut = True
+            i = 0
+            while i < last:
+                i += 1
+                nx, ny = xs[i], ys[i]
+                move = follow[(x - nx) * 5 + y - ny + 12]
+                if move is None:
+                    # nothing behind a knot that stays put can move either
+                    break
+                mx, my = move
+                if taut and (mx != dx or my != dy):
+                    taut = False
+                x = xs[i] = nx + mx
+                y = ys[i] = ny + my
+            else:
+                history.add(x, y)
+                if taut:
+                    # every knot moved with the head, so every later step of
+                    # this move is the same translation of the whole rope
+                    self.translate(dx, dy, count - step - 1)
+                    return
+
+    def translate(self, dx: int, dy: int, steps: int):
+        xs, ys = self.xs, self.ys
+        self.l_history.add_line(xs[-1], ys[-1], dx, dy, steps)
+        for i in range(len(xs)):
+            xs[i] += dx * steps
+            ys[i] += dy * steps
 
     def follow(self, h: complex, l: complex):
         diff = h - l
-        dx, dy = diff.real, diff.imag
-        dx_unit = abs(dx) / dx if dx else 0
-        dy_unit = complex(0, abs(dy) / dy) if dy else 0
-        if abs(dx) == 2:
-            l += dx_unit
-            if abs(dy) >= 1:
-                l += dy_unit
-        elif abs(dy) == 2:
-            l += dy_unit
-            if abs(dx) >= 1:
-                l += dx_unit
-        return l
+        move = FOLLOW[offset(int(diff.real), int(diff.imag))]
+        return l if move is None else l + complex(*move)
 
 
-if __name__ == '__main__':
-    rope = Rope(raw, length=2)
+def count_tail_positions(raw: str, length: int):
+    rope = Rope(raw.strip(), length=length)
     rope.do_moves()
-    print(len(rope.l_history))
+    return len(rope.l_history)
 
-    rope = Rope(raw, length=10)
-    rope.do_moves()
-    print(len(rope.l_history))
+
+def part1(raw: str):
+    return count_tail_positions(raw, 2)
+
+
+def part2(raw: str):
+    return count_tail_positions(raw, 10)
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == '__main__':
+    for answer in solve(file.read_text()):
+        print(answer)
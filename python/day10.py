@@ -1,10 +1,23 @@
+from array import array
 from functools import cached_property
+from itertools import accumulate
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Literal
+from typing import BinaryIO, Iterable, Iterator, Literal
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from stream import read_lines
 
 file = Path(__file__).parent.parent / "data" / "day10.txt"
-raw = file.read_text().strip()
+
+WIDTH = 40
+SIGNAL_CYCLES = range(20, 221, 40)
+OPCODES = {'noop', 'addx'}
 
 
 @dataclass
@@ -18,50 +31,104 @@ class AddxInstruction:
     code: Literal['addx'] = 'addx'
 
 
+def parse(lines: Iterable[str]):
+    for line in lines:
+        match line.split():
+            case [NoopInstruction.code]:
+                yield NoopInstruction()
+            case [AddxInstruction.code, x]:
+                yield AddxInstruction(value=int(x))
+
+
+def trace(lines: Iterable[str]) -> Iterator[int]:
+    # X during each cycle, followed by X once the program has finished
+    x = 1
+    for line in lines:
+        for token in line.split():
+            yield x
+            if token not in OPCODES:
+                x += int(token)
+    yield x
+
+
+def render(values: Iterable[int], width=WIDTH) -> Iterator[str]:
+    # a row is emitted once the cycle after it has a value
+    row: list[str] = []
+    for i, val in enumerate(values):
+        x = i % width
+        if x == 0 and row:
+            yield ''.join(row)
+            row = []
+        row.append('#' if abs(x - val) <= 1 else '.')
+
+
 @dataclass
 class Cpu:
     data: str
 
-    @property
+    @cached_property
     def instructions(self):
-        for line in self.data.splitlines():
-            match line.split():
-                case [NoopInstruction.code]:
-                    yield NoopInstruction()
-                case [AddxInstruction.code, x]:
-                    yield AddxInstruction(value=int(x))
+        return list(parse(self.data.splitlines()))
+
+    @cached_property
+    def deltas(self):
+        # the change to X at the end of every cycle: every token of the program
+        # takes one cycle, and only an addx operand changes X
+        return array('q', [0 if token in OPCODES else int(token) for token in self.data.split()])
 
     @cached_property
     def values(self):
-        values = [1]
-        for instr in self.instructions:
-            values.append(values[-1])
-            if instr.code == AddxInstruction.code:
-                values.append(values[-1] + instr.value)
-        return values
+        # values[i] is X during cycle i + 1
+        if np is not None:
+            values = np.empty(len(self.deltas) + 1, dtype=np.int64)
+            values[0] = 1
+            np.cumsum(np.frombuffer(self.deltas, dtype=np.int64), out=values[1:])
+            values[1:] += 1
+            return values
+        return list(accumulate(self.deltas, initial=1))
 
     def signal_strength(self, cycle: int):
-        return self.values[cycle-1] * cycle
+        return int(self.values[cycle-1]) * cycle
+
+    def signal_strengths(self, cycles: Iterable[int]):
+        return sum(self.signal_strength(i) for i in cycles)
 
     def get_signal_strengths(self):
-        return sum(self.signal_strength(i) for i in range(20, 221, 40))
+        return self.signal_strengths(SIGNAL_CYCLES)
 
     def draw(self):
-        output = []
-        row = []
-        for i, val in enumerate(self.values):
-            x = i % 40
-            cycle = x + 1
-            if x == 0 and row:
-                output.append(row)
-                row = []
-            row.append('#' if cycle in range(val, val + 3) else '.')
-        return '\n'.join(''.join(row) for row in output)
-
-
-cpu = Cpu(raw)
-value = cpu.get_signal_strengths()
-print(value)
-
-drawing = cpu.draw()
-print(drawing)
+        values = self.values
+        if np is None:
+            return '\n'.join(render(values))
+        rows = (len(values) - 1) // WIDTH
+        lit = np.abs(values[:rows * WIDTH].reshape(rows, WIDTH) - np.arange(WIDTH)) <= 1
+        pixels = np.where(lit, ord('#'), ord('.')).astype(np.uint8)
+        return '\n'.join(row.tobytes().decode() for row in pixels)
+
+
+def part1(raw: str):
+    return Cpu(raw.strip()).get_signal_strengths()
+
+
+def part2(raw: str):
+    return Cpu(raw.strip()).draw()
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+def stream_crt(source: Path | str | BinaryIO = file, width=WIDTH):
+    # constant memory: only the current X and the row being drawn are kept
+    return render(trace(read_lines(source)), width)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # python day10.py <file or -> streams the crt rows
+        source = sys.stdin.buffer if sys.argv[1] == '-' else sys.argv[1]
+        for row in stream_crt(source):
+            print(row, flush=True)
+    else:
+        for answer in solve(file.read_text()):
+            print(answer)
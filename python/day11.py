@@ -1,10 +1,33 @@
 from functools import cached_property
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from math import lcm, prod
+from typing import Callable
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 file = Path(__file__).parent.parent / "data" / "day11.txt"
-raw = file.read_text().strip()
+
+OPERATORS = {'+': operator.add, '*': operator.mul}
+# below this many items a numpy turn costs more than it saves
+NUMPY_MIN_ITEMS = 64
+INT64_MAX = 2**63 - 1
+
+
+def compile_operation(operation: str) -> Callable:
+    # "old * old", "old * 19", "old + 6"; the result also works on numpy arrays
+    left, symbol, right = operation.split()
+    func = OPERATORS[symbol]
+    if left != 'old':
+        left, right = right, left
+    if right == 'old':
+        return lambda old: func(old, old)
+    value = int(right)
+    return lambda old: func(old, value)
 
 
 @dataclass
@@ -14,14 +37,17 @@ class Monkey:
     test: int
     if_true: int
     if_false: int
+    apply: Callable = field(init=False, repr=False)
     inspection_count = 0
 
+    def __post_init__(self):
+        self.apply = compile_operation(self.operation)
+
     @classmethod
     def parse(cls, data: str):
         _, a, b, c, d, e = data.splitlines()
         items = list(map(int, a.split(':')[1].split(',')))
         operation = b.split('=')[1].strip()
-        operation = '{old}'.join(operation.split('old'))
         test = int(c.split()[-1])
         if_true = int(d.split()[-1])
         if_false = int(e.split()[-1])
@@ -30,7 +56,7 @@ class Monkey:
     def throw_to(self, item_id: int, maximum_worry=False, divisor=0):
         self.inspection_count += 1
         item = self.items[item_id]
-        val: int = eval(self.operation.format(old=item))
+        val: int = self.apply(item)
         if not maximum_worry:
             val = val // 3
         if divisor:
@@ -50,31 +76,127 @@ class MonkeyList:
             self.do_turn(monkey)
 
     def do_turn(self, monkey: Monkey):
-        for i in range(len(monkey.items)):
-            throw_to = monkey.throw_to(i, maximum_worry=self.maximum_worry, divisor=self.lcm)
-            self.monkeys[throw_to].items.append(monkey.items[i])
+        # the same as calling throw_to for each item, for the whole hand at once
+        items = monkey.items
+        if not items:
+            return
+        monkey.inspection_count += len(items)
+        if self.use_numpy and len(items) >= NUMPY_MIN_ITEMS:
+            self.np_turn(monkey)
+            return
+        apply, divisor = monkey.apply, self.lcm
+        if self.maximum_worry:
+            values = [apply(x) % divisor for x in items]
+        else:
+            values = [apply(x) // 3 % divisor for x in items]
+        test = monkey.test
+        self.monkeys[monkey.if_true].items.extend([x for x in values if not x % test])
+        self.monkeys[monkey.if_false].items.extend([x for x in values if x % test])
         monkey.items = []
 
+    def np_turn(self, monkey: Monkey):
+        assert np is not None
+        values = monkey.apply(np.array(monkey.items, dtype=np.int64))
+        if not self.maximum_worry:
+            values //= 3
+        values %= self.lcm
+        passed = values % monkey.test == 0
+        self.monkeys[monkey.if_true].items.extend(values[passed].tolist())
+        self.monkeys[monkey.if_false].items.extend(values[~passed].tolist())
+        monkey.items = []
+
+    @cached_property
+    def use_numpy(self):
+        # items are kept below lcm, so int64 is safe if the worst operation is
+        bound = max(self.lcm - 1, *(max(m.items, default=0) for m in self.monkeys))
+        return np is not None and all(m.apply(bound) <= INT64_MAX for m in self.monkeys)
+
+    # every item moves independently of the others, and under the lcm modulus
+    # its (worry, holder) state at the start of a round must eventually repeat
+
+    def item_round(self, value: int, holder: int):
+        # one round for a lone item: it keeps moving while it is thrown to a
+        # monkey whose turn is still to come
+        visited = []
+        while True:
+            visited.append(holder)
+            monkey = self.monkeys[holder]
+            value = monkey.apply(value)
+            if not self.maximum_worry:
+                value //= 3
+            value %= self.lcm
+            throw_to = monkey.if_false if value % monkey.test else monkey.if_true
+            if throw_to <= holder:
+                return value, throw_to, visited
+            holder = throw_to
+
+    def item_counts(self, value: int, holder: int, rounds: int):
+        seen: dict[tuple[int, int], int] = {}
+        history: list[list[int]] = []
+        state = (value, holder)
+        while len(history) < rounds and state not in seen:
+            seen[state] = len(history)
+            value, holder, visited = self.item_round(*state)
+            history.append(visited)
+            state = (value, holder)
+
+        counts = [0] * len(self.monkeys)
+        if len(history) == rounds:
+            repeats = {}
+        else:
+            start = seen[state]
+            cycles, rest = divmod(rounds - start, len(history) - start)
+            repeats = {r: cycles for r in range(start, len(history))}
+            repeats.update({r: cycles + 1 for r in range(start, start + rest)})
+        for r, visited in enumerate(history):
+            for holder in visited:
+                counts[holder] += repeats.get(r, 1)
+        return counts
+
+    def inspection_counts(self, rounds: int):
+        # the per-monkey counts after `rounds` rounds without playing them all
+        counts = [0] * len(self.monkeys)
+        cache: dict[tuple[int, int], list[int]] = {}
+        for holder, monkey in enumerate(self.monkeys):
+            for value in monkey.items:
+                if (value, holder) not in cache:
+                    cache[(value, holder)] = self.item_counts(value, holder, rounds)
+                counts = [a + b for a, b in zip(counts, cache[(value, holder)])]
+        return counts
+
     @cached_property
     def lcm(self):
         return lcm(*(x.test for x in self.monkeys))
 
 
-def get_monkeys():
-    return MonkeyList(monkeys=[Monkey.parse(x) for x in raw.split('\n\n')])
+def get_monkeys(raw: str):
+    return MonkeyList(monkeys=[Monkey.parse(x) for x in raw.strip().split('\n\n')])
 
 
-if __name__ == '__main__':
-    monkeys = get_monkeys()
-    for i in range(20):
+def monkey_business(raw: str, rounds: int, maximum_worry=False, extrapolate=False):
+    monkeys = get_monkeys(raw)
+    monkeys.maximum_worry = maximum_worry
+    if extrapolate:
+        out = sorted(monkeys.inspection_counts(rounds))
+        return prod(out[-2:])
+    for _ in range(rounds):
         monkeys.do_round()
-
     out = sorted((x.inspection_count for x in monkeys.monkeys))
-    print(prod(out[-2:]))
+    return prod(out[-2:])
 
-    monkeys = get_monkeys()
-    monkeys.maximum_worry = True
-    for i in range(10_000):
-        monkeys.do_round()
-    out = sorted((x.inspection_count for x in monkeys.monkeys))
-    print(prod(out[-2:]))
+
+def part1(raw: str):
+    return monkey_business(raw, 20)
+
+
+def part2(raw: str):
+    return monkey_business(raw, 10_000, maximum_worry=True, extrapolate=True)
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == '__main__':
+    for answer in solve(file.read_text()):
+        print(answer)
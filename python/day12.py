@@ -1,82 +1,150 @@
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+from dataclasses import dataclass, field
 from pathlib import Path
 from string import ascii_lowercase
-from queue import Queue
+from typing import Iterable
 
-ASCII = {ch: i for i, ch in enumerate(ascii_lowercase)}
-ASCII["S"] = ASCII["a"]
-ASCII["E"] = ASCII["z"]
+from grid import Grid
+
+HEIGHTS = bytes.maketrans(b"SE" + ascii_lowercase.encode(), bytes([0, 25, *range(26)]))
+BORDER = 255
+UNREACHED = -1
 
 file = Path(__file__).parent.parent / "data" / "day12.txt"
-raw = file.read_text().strip()
 
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
+@dataclass
+class Hill:
+    grid: Grid
+    start: int
+    end: int
+    # distance fields keyed by (source, backwards)
+    fields: dict[tuple[int, bool], array] = field(default_factory=dict)
 
-    def __add__(self, other):
-        return Point(x=self.x + other.x, y=self.y + other.y)
+    @classmethod
+    def parse(cls, data: str):
+        grid = Grid.parse(data, border=BORDER)
+        start = grid.find(ord("S"))
+        end = grid.find(ord("E"))
+        grid.cells = grid.cells.translate(HEIGHTS)
+        return cls(grid=grid, start=start, end=end)
 
-    def __sub__(self, other):
-        return Point(x=self.x - other.x, y=self.y - other.y)
+    def find_end(self, start: int, backwards=False):
+        # the distance from start to every cell, UNREACHED where there's no path
+        cells = self.grid.cells
+        adj4 = self.grid.adj4
+        dist = array('i', [UNREACHED]) * len(cells)
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            point = queue.popleft()
+            height = cells[point]
+            lowest = height - 1 if backwards else 0
+            highest = 25 if backwards else height + 1
+            step = dist[point] + 1
+            for d in adj4:
+                other = point + d
+                if dist[other] == UNREACHED and lowest <= cells[other] <= highest:
+                    dist[other] = step
+                    queue.append(other)
+        return dist
 
+    def distances(self, source: int, backwards=False):
+        key = (source, backwards)
+        if key not in self.fields:
+            self.fields[key] = self.find_end(source, backwards)
+        return self.fields[key]
 
-DIRS = [Point(x=1, y=0), Point(x=-1, y=0), Point(x=0, y=-1), Point(x=0, y=1)]
+    def shortest(self, starts: Iterable[int], target: int):
+        # every start is looked up in the target's backwards field
+        dist = self.distances(target, backwards=True)
+        return min((dist[x] for x in starts if dist[x] != UNREACHED), default=None)
 
+    def allowed(self, point: int, other: int, backwards=False):
+        height, other_height = self.grid.cells[point], self.grid.cells[other]
+        if other_height == BORDER:
+            return False
+        return other_height >= height - 1 if backwards else other_height <= height + 1
 
-@dataclass
-class Hill:
-    map: dict[Point, str]
-    start: Point
-    end: Point
+    def set_heights(self, changes: dict[int, int]):
+        # change some heights and repair every cached field around them
+        for point, height in changes.items():
+            if not 0 <= height <= 25 or self.grid.cells[point] == BORDER:
+                raise ValueError(f"can't set cell {point} to height {height}")
+        for point, height in changes.items():
+            self.grid.cells[point] = height
+        for (source, backwards), dist in self.fields.items():
+            self.repair(dist, source, backwards, changes)
 
-    @classmethod
-    def parse(cls, data: str):
-        m: dict[Point, str] = {}
-        start = Point(x=0, y=0)
-        end = Point(x=0, y=0)
-        for y, row in enumerate(data.splitlines()):
-            for x, ch in enumerate(row):
-                if ch == "S":
-                    start = Point(x=x, y=y)
-                elif ch == "E":
-                    end = Point(x=x, y=y)
-                m[Point(x=x, y=y)] = ch
-        return cls(map=m, start=start, end=end)
-
-    def find_end(self, start, backwards=False):
-        queue: Queue[tuple[Point, int]] = Queue()
-        queue.put((start, 0))
-        visited: dict[Point, int] = {}
-        while not queue.empty():
-            point, dist = queue.get()
-            if found := visited.get(point, None):
-                if dist >= found:
-                    continue
-            else:
-                visited[point] = dist
-            height = ASCII[self.map[point]]
-            for d in DIRS:
+    def repair(self, dist: array, source: int, backwards: bool, changed: Iterable[int]):
+        # only edges touching a changed cell can differ, so the work starts
+        # from those cells and spreads only as far as distances really change
+        adj4 = self.grid.adj4
+        touched = {x + d for x in changed for d in (0, *adj4)}
+
+        # cells that lost every neighbour that could have been their parent on
+        # a shortest path, then their children in turn
+        invalid: set[int] = set()
+        stack = list(touched)
+        while stack:
+            point = stack.pop()
+            if point in invalid or point == source or dist[point] == UNREACHED:
+                continue
+            parent = dist[point] - 1
+            if any(
+                dist[point - d] == parent and point - d not in invalid and self.allowed(point - d, point, backwards)
+                for d in adj4
+            ):
+                continue
+            invalid.add(point)
+            stack.extend(point + d for d in adj4 if dist[point + d] == parent + 2)
+        for point in invalid:
+            dist[point] = UNREACHED
+
+        # reseed from the best valid neighbour and let improvements spread
+        heap: list[tuple[int, int]] = []
+        for point in invalid | touched:
+            if self.grid.cells[point] == BORDER:
+                continue
+            best = dist[point]
+            for d in adj4:
+                other = point - d
+                if dist[other] != UNREACHED and self.allowed(other, point, backwards):
+                    if best == UNREACHED or dist[other] + 1 < best:
+                        best = dist[other] + 1
+            if best != dist[point]:
+                dist[point] = best
+                heappush(heap, (best, point))
+        while heap:
+            step, point = heappop(heap)
+            if step != dist[point]:
+                continue
+            for d in adj4:
                 other = point + d
-                other_val = self.map.get(other, None)
-                if other_val is None:
-                    continue
-                other_height = ASCII[other_val]
-                if backwards:
-                    if other_height >= height - 1:
-                        queue.put((other, dist+1))
-                else:
-                    if other_height <= height + 1:
-                        queue.put((other, dist + 1))
-        return visited
+                if (dist[other] == UNREACHED or dist[other] > step + 1) and self.allowed(point, other, backwards):
+                    dist[other] = step + 1
+                    heappush(heap, (step + 1, other))
 
     def get_all_a(self):
-        return [x for x, y in self.map.items() if y in 'Sa']
+        return list(self.grid.indices(HEIGHTS[ord("a")]))
+
+
+def part1(raw: str):
+    hill = Hill.parse(raw.strip())
+    return hill.shortest([hill.start], hill.end)
+
+
+def part2(raw: str):
+    hill = Hill.parse(raw.strip())
+    return hill.shortest(hill.get_all_a(), hill.end)
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
 
 
-hill = Hill.parse(raw)
-distances = hill.find_end(hill.end, backwards=True)
-print(distances[hill.start])
-print(min(*[distances.get(x, float('inf')) for x in hill.get_all_a()]))
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
@@ -1,20 +1,73 @@
 from math import prod
-from functools import cmp_to_key
 from pathlib import Path
-from ast import literal_eval
-from typing import TypeAlias
+from typing import BinaryIO, Iterable, Iterator, TypeAlias
+
+from stream import read_lines
 
 file = Path(__file__).parent.parent / "data" / "day13.txt"
-raw = file.read_text().strip()
 
 ListPiece: TypeAlias = int | list['ListPiece']
 
+DECODER_KEYS: list[ListPiece] = [[[2]], [[6]]]
+
 LESSER = -1
 EQUAL = 0
 GREATER = 1
 
+# sort key tokens around the integers themselves; a closing bracket sorts
+# before anything, and an opening bracket is never compared with an integer
+CLOSE = float('-inf')
+OPEN = float('inf')
+
+DIGITS = frozenset('0123456789')
+WHITESPACE = frozenset(' \t\r\n')
+
+
+def parse_packet(line: str) -> ListPiece:
+    # a value may follow '[' or ',', and only ',' or ']' may follow a value;
+    # like literal_eval a trailing comma before ']' is fine
+    stack: list[list[ListPiece]] = [[]]
+    expect_value = True
+    i, size = 0, len(line)
+    while i < size:
+        ch = line[i]
+        if ch in WHITESPACE:
+            i += 1
+            continue
+        if expect_value and (ch in DIGITS or ch == '-'):
+            start = i
+            i += 1
+            while i < size and line[i] in DIGITS:
+                i += 1
+            if line[i - 1] == '-':
+                raise ValueError(f'malformed packet: {line!r}')
+            stack[-1].append(int(line[start:i]))
+            expect_value = False
+            continue
+        if expect_value and ch == '[':
+            stack.append([])
+        elif ch == ']' and len(stack) > 1:
+            done = stack.pop()
+            stack[-1].append(done)
+            expect_value = False
+        elif ch == ',' and not expect_value and len(stack) > 1:
+            expect_value = True
+        else:
+            raise ValueError(f'malformed packet: {line!r}')
+        i += 1
+    if len(stack) != 1 or len(stack[0]) != 1:
+        raise ValueError(f'malformed packet: {line!r}')
+    return stack[0][0]
+
+
 def parse(data: str) -> list[tuple[ListPiece, ListPiece]]:
-    return [tuple(map(literal_eval, pair.split('\n'))) for pair in data.split('\n\n')]
+    return [tuple(map(parse_packet, pair.split('\n'))) for pair in data.strip().split('\n\n')]
+
+
+def read_packets(source: Path | str | BinaryIO = file) -> Iterator[ListPiece]:
+    for line in read_lines(source):
+        if line.strip():
+            yield parse_packet(line)
 
 def compare(a: ListPiece, b: ListPiece):
     match [a, b]:
@@ -42,11 +95,90 @@ def compare(a: ListPiece, b: ListPiece):
     raise Exception('how did we get here.')
 
 
-pairs = parse(raw)
-print(f'Part 1: {sum([i+1 for i, pair in enumerate(pairs) if compare(*pair) == LESSER])}')
+def depth(a: ListPiece) -> int:
+    if isinstance(a, int):
+        return 0
+    return 1 + max(map(depth, a), default=0)
+
+
+def packet_key(a: ListPiece, max_depth: int):
+    """A flat tuple that sorts the same way `compare` does.
+
+    An integer compares exactly like the one-item list holding it, so every
+    integer is wrapped until it sits `max_depth` lists deep. After that no
+    integer is ever compared with a list. What's left is a plain lexicographic
+    comparison of brackets and values, where a closing bracket sorts first.
+    Keys only agree with `compare` when built with the same `max_depth`, which
+    must be at least the depth of every packet involved.
+    """
+    tokens: list[float] = []
+
+    def walk(a: ListPiece, level: int):
+        if isinstance(a, int):
+            pad = max_depth - level
+            tokens.extend([OPEN] * pad)
+            tokens.append(a)
+            tokens.extend([CLOSE] * pad)
+            return
+        tokens.append(OPEN)
+        for x in a:
+            walk(x, level + 1)
+        tokens.append(CLOSE)
+
+    walk(a, 0)
+    return tuple(tokens)
+
+
+def packet_keys(packets: list[ListPiece]):
+    max_depth = max(map(depth, packets), default=0)
+    return [packet_key(x, max_depth) for x in packets]
+
+
+def in_order(a: ListPiece, b: ListPiece):
+    max_depth = max(depth(a), depth(b))
+    return packet_key(a, max_depth) < packet_key(b, max_depth)
+
+
+def ranks(packets: Iterable[ListPiece], dividers: list[ListPiece]):
+    """Where each divider would land (1-based) if it were added to `packets`
+    after them and everything was sorted, without sorting anything.
+    """
+    divider_depth = max(map(depth, dividers), default=0)
+    divider_keys: dict[int, list[tuple[int, ...]]] = {}
+    before = [0] * len(dividers)
+    for packet in packets:
+        max_depth = max(depth(packet), divider_depth)
+        if max_depth not in divider_keys:
+            divider_keys[max_depth] = [packet_key(x, max_depth) for x in dividers]
+        key = packet_key(packet, max_depth)
+        for i, divider in enumerate(divider_keys[max_depth]):
+            # a stable sort keeps equal packets ahead of the dividers
+            if key <= divider:
+                before[i] += 1
+
+    keys = [packet_key(x, divider_depth) for x in dividers]
+    return [
+        before[i] + 1 + sum(other < key or (other == key and j < i) for j, other in enumerate(keys) if j != i)
+        for i, key in enumerate(keys)
+    ]
+
+
+def part1(raw: str):
+    pairs = parse(raw)
+    return sum([i+1 for i, pair in enumerate(pairs) if in_order(*pair)])
+
+def part2(raw: str):
+    pairs = parse(raw)
+    return prod(ranks((x for pair in pairs for x in pair), DECODER_KEYS))
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+def solve_stream(source: Path | str | BinaryIO = file, dividers: list[ListPiece] = DECODER_KEYS):
+    return ranks(read_packets(source), dividers)
+
 
-DECODER_KEYS: ListPiece = [[[2]], [[6]]]
-complete_list = sum([list(pair) for pair in pairs], start=[]) + DECODER_KEYS
-complete_list.sort(key=cmp_to_key(compare))
-p2 = prod([i+1 for i, x in enumerate(complete_list) if x in DECODER_KEYS])
-print(f'Part 2: {p2}')
+if __name__ == "__main__":
+    raw = file.read_text()
+    print(f'Part 1: {part1(raw)}')
+    print(f'Part 2: {part2(raw)}')
@@ -1,103 +1,142 @@
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+from grid import Grid
+
 file = Path(__file__).parent.parent / "data" / "day14.txt"
-raw = file.read_text().strip()
 
 
 class Element(Enum):
     AIR = '.'
     ROCK = '#'
     SAND = 'o'
+    ABYSS = '~'
 
 
-FALLPATH: list[tuple[int, int]] = [(0, 1), (-1, 1), (1, 1)]
+AIR = ord(Element.AIR.value)
+ROCK = ord(Element.ROCK.value)
+SAND = ord(Element.SAND.value)
+ABYSS = ord(Element.ABYSS.value)
 
+FALLPATH: list[tuple[int, int]] = [(0, 1), (-1, 1), (1, 1)]
 
-MapType = dict[tuple[int, int], Element]
 
 @dataclass
 class Cave:
-    map: MapType
+    grid: Grid
     x_range: tuple[int, int]
     y_range: tuple[int, int]
+    # grid column of x == 0
+    x_offset: int
     start: tuple[int, int] = (500, 0)
+    # the previous grain's fall, the next grain takes the same way until it
+    # reaches the last cell it could still have moved on from
+    path: list[int] = field(default_factory=list)
+    has_floor = False
 
     @classmethod
     def parse(cls, data: str):
-        m: MapType = {}
-        xmin = float('inf')
-        ymin = float('inf')
-        xmax = float('-inf')
-        ymax = float('-inf')
+        segments: list[tuple[int, int, int, int]] = []
         for line in data.splitlines():
-            parts = line.split('->')
-            for start, end in zip(parts, parts[1:]):
-                a, b = map(int, start.split(','))
-                c, d = map(int, end.split(','))
-                if a == c:
-                    small = min(b, d)
-                    big = max(b, d)
-                    for i in range(small, big + 1):
-                        m[(a, i)] = Element.ROCK
-                        xmin = min(a, xmin)
-                        xmax = max(a, xmax)
-                        ymin = min(i, ymin)
-                        ymax = max(i, ymax)
-                elif b == d:
-                    small = min(a, c)
-                    big = max(a, c)
-                    for i in range(small, big + 1):
-                        m[(i, b)] = Element.ROCK
-                        xmin = min(i, xmin)
-                        xmax = max(i, xmax)
-                        ymin = min(b, ymin)
-                        ymax = max(b, ymax)
-        return cls(map=m, x_range=(int(xmin), int(xmax)), y_range=(int(ymin), int(ymax)))
+            points = [tuple(map(int, part.split(','))) for part in line.split('->')]
+            segments.extend((a, b, c, d) for (a, b), (c, d) in zip(points, points[1:]))
+        xs = [x for a, _, c, _ in segments for x in (a, c)]
+        ys = [y for _, b, _, d in segments for y in (b, d)]
+        x_range, y_range = (min(xs), max(xs)), (min(ys), max(ys))
+
+        # the floor is two below the lowest rock and sand piles up at most
+        # that far either side of the source
+        start_x, _ = cls.start
+        height = y_range[1] + 2
+        left = min(x_range[0], start_x - height) - 1
+        right = max(x_range[1], start_x + height) + 1
+        grid = Grid(right - left + 1, height, fill=AIR, border=ROCK)
+        cave = cls(grid=grid, x_range=x_range, y_range=y_range, x_offset=-left)
+        for a, b, c, d in segments:
+            for x in range(min(a, c), max(a, c) + 1):
+                for y in range(min(b, d), max(b, d) + 1):
+                    grid[cave.index(x, y)] = ROCK
+        if not cls.has_floor:
+            # the row below the lowest rock, anything reaching it falls forever
+            row = grid.index(0, height - 1)
+            grid.cells[row:row + grid.width] = bytes([ABYSS]) * grid.width
+        cave.path.append(cave.index(*cave.start))
+        return cave
+
+    def index(self, x: int, y: int):
+        return self.grid.index(x + self.x_offset, y)
+
+    def point(self, index: int):
+        x, y = self.grid.point(index)
+        return x - self.x_offset, y
 
     def draw(self, pad=10):
         rows = []
-        for y in range(self.y_range[0] - pad, self.y_range[1] + 1 + pad):
-            rows.append(''.join(self.map.get((x, y), Element.AIR).value for x in range(self.x_range[0] - pad, self.x_range[1] + 1 + pad)))
+        for y in range(max(self.y_range[0] - pad, 0), min(self.y_range[1] + 1 + pad, self.grid.height)):
+            rows.append(''.join(
+                chr(self.grid[self.index(x, y)])
+                for x in range(self.x_range[0] - pad, self.x_range[1] + 1 + pad)
+                if 0 <= x + self.x_offset < self.grid.width
+            ))
         return '\n'.join(rows)
 
     def step(self):
-        return self.find_resting_point(self.start)
+        # drops one grain and returns where it settled, None once nothing settles
+        cells = self.grid.cells
+        moves = [self.grid.offset(dx, dy) for dx, dy in FALLPATH]
+        path = self.path
+        while path:
+            point = path[-1]
+            for move in moves:
+                cell = cells[point + move]
+                if cell == AIR:
+                    path.append(point + move)
+                    break
+                if cell == ABYSS:
+                    path.clear()
+                    return None
+            else:
+                cells[point] = SAND
+                path.pop()
+                return self.point(point)
+        return None
 
     def step_until_finished(self):
-        while point := self.step():
-            self.map[point] = Element.SAND
-            if point == self.start:
-                break
+        while self.step():
+            pass
 
     def find_resting_point(self, point: tuple[int, int]) -> tuple[int, int] | None:
-        if point[1] > self.y_range[1]:
-            return None
-        for vector in FALLPATH:
-            dx, dy = vector
-            npoint = point[0] + dx, point[1] + dy
-            if self.map.get(npoint, Element.AIR) == Element.AIR:
-                return self.find_resting_point(npoint)
-        return point
+        # where a grain dropped at `point` would settle right now
+        self.path = [self.index(*point)]
+        settled = self.step()
+        if settled is not None:
+            self.grid[self.index(*settled)] = AIR
+        self.path = [self.index(*self.start)]
+        return settled
 
 
 class CaveWithFloor(Cave):
-    def find_resting_point(self, point: tuple[int, int]) -> tuple[int, int] | None:
-        if point[1] == self.y_range[1] + 1:
-            return point
-        for vector in FALLPATH:
-            dx, dy = vector
-            npoint = point[0] + dx, point[1] + dy
-            if self.map.get(npoint, Element.AIR) == Element.AIR:
-                return self.find_resting_point(npoint)
-        return point
-
-
-cave = Cave.parse(raw)
-cave.step_until_finished()
-print(len([x for x in cave.map.values() if x == Element.SAND]))
-
-cave = CaveWithFloor.parse(raw)
-cave.step_until_finished()
-print(len([x for x in cave.map.values() if x == Element.SAND]))
+    has_floor = True
+
+
+def count_sand(cave: Cave):
+    cave.step_until_finished()
+    return cave.grid.cells.count(SAND)
+
+
+def part1(raw: str):
+    return count_sand(Cave.parse(raw.strip()))
+
+
+def part2(raw: str):
+    return count_sand(CaveWithFloor.parse(raw.strip()))
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
@@ -4,7 +4,8 @@ from dataclasses import dataclass
 import re
 
 file = Path(__file__).parent.parent / "data" / "day15.txt"
-raw = file.read_text().strip()
+ROW = 2000000
+MAX_VAL = 4000000
 
 Point = tuple[int, int]
 
@@ -91,12 +92,21 @@ class SensorMap:
         raise Exception
 
 
-smap = SensorMap.parse(raw)
+def part1(raw: str):
+    smap = SensorMap.parse(raw.strip())
+    return smap.find_empty_spaces(ROW)
 
 
-count = smap.find_empty_spaces(2000000)
-print(count)
+def part2(raw: str):
+    smap = SensorMap.parse(raw.strip())
+    pos = smap.find_empty_space(MAX_VAL)
+    return pos[0] * MAX_VAL + pos[1]
 
-pos = smap.find_empty_space(4000000)
-p2 = pos[0] * 4000000 + pos[1]
-print(p2)
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
@@ -3,7 +3,6 @@ import re
 from itertools import product
 
 file = Path(__file__).parent.parent / "data" / "day16.txt"
-raw = file.read_text().strip()
 
 # raw = """Valve AA has flow rate=0; tunnels lead to valves DD, II, BB
 # Valve BB has flow rate=13; tunnels lead to valves CC, AA
@@ -28,12 +27,13 @@ def parse(data: str):
         valves[name] = (rate, to_valve_set)
     return valves
 
-VALVES = parse(raw)
-VALVE_KEYS = set(VALVES.keys())
-NEED_TO_OPEN = set(a for a, b in VALVES.items() if b[0] > 0)
 START = 'AA'
 
-def traverse():
+def need_to_open(valves: ValveMap):
+    return set(a for a, b in valves.items() if b[0] > 0)
+
+def traverse(valves: ValveMap):
+    to_open = need_to_open(valves)
     stack: list[tuple[str, str|None, dict[str, int], int]] = [(START, None, {}, 30)]
     maximum = 0
     # inspected = 0
@@ -43,8 +43,8 @@ def traverse():
         #     print(f'nodes inspected: {inspected}')
         valve, prev, opened, minutes = stack.pop()
 
-        valves_left = NEED_TO_OPEN - opened.keys()
-        valves_left_values = [VALVES[x][0] for x in valves_left]
+        valves_left = to_open - opened.keys()
+        valves_left_values = [valves[x][0] for x in valves_left]
         valves_left_values.sort(reverse=True)
         max_possible = sum(x * max(minutes - (i*2), 0) for i, x in enumerate(valves_left_values)) + sum(opened.values())
 
@@ -54,7 +54,7 @@ def traverse():
         if minutes <= 1 or len(valves_left) == 0:
             maximum = max(maximum, sum(opened.values()))
             continue
-        rate, to_valves = VALVES[valve]
+        rate, to_valves = valves[valve]
         next_minutes = minutes - 1
         if valve not in opened and rate > 0:
             # open valve
@@ -68,7 +68,8 @@ def traverse():
     return maximum
 
 
-def double_traverse():
+def double_traverse(valves: ValveMap):
+    to_open = need_to_open(valves)
     stack: list[tuple[str, str, str|None, str|None, dict[str, int], int]] = [(START, START, None, None, {}, 26)]
     maximum = 0
     # inspected = 0
@@ -78,8 +79,8 @@ def double_traverse():
         #     print(f'nodes inspected: {inspected}')
         valve1, valve2, prev1, prev2, opened, minutes = stack.pop()
 
-        valves_left = NEED_TO_OPEN - opened.keys()
-        valves_left_values = [VALVES[x][0] for x in valves_left]
+        valves_left = to_open - opened.keys()
+        valves_left_values = [valves[x][0] for x in valves_left]
         valves_left_values.sort(reverse=True)
         max_possible = sum(x * max(minutes - ((i//2)*2), 0) for i, x in enumerate(valves_left_values)) + sum(opened.values())
 
@@ -90,8 +91,8 @@ def double_traverse():
             maximum = max(maximum, sum(opened.values()))
             continue
 
-        rate1, to_valves1 = VALVES[valve1]
-        rate2, to_valves2 = VALVES[valve2]
+        rate1, to_valves1 = valves[valve1]
+        rate2, to_valves2 = valves[valve2]
         to_valves2 = to_valves2 - {prev1, prev2, valve1}
         to_valves1 = to_valves1 - {prev1, prev2, valve2}
         next_minutes = minutes - 1
@@ -119,10 +120,18 @@ def double_traverse():
     return maximum
 
 
-# print(VALVES)
+def part1(raw: str):
+    return traverse(parse(raw.strip()))
+
+
+def part2(raw: str):
+    return double_traverse(parse(raw.strip()))
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
 
-out = traverse()
-print(out)
 
-out = double_traverse()
-print(out)
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
@@ -1,11 +1,11 @@
+from functools import cached_property
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from grid import Grid
 
-file = Path(__file__).parent.parent / "data" / "day17.txt"
-raw = file.read_text().strip()
 
-raw = raw.strip()
+file = Path(__file__).parent.parent / "data" / "day17.txt"
 
 @dataclass(frozen=True)
 class Point:
@@ -23,43 +23,12 @@ class Point:
 class Block:
     map: list[Point]
 
-    @property
-    def left(self):
-        left = self.map[0]
-        for point in self.map[1:]:
-            if point.x < left.x:
-                left = point
-        return left
-
-    @property
-    def right(self):
-        right = self.map[0]
-        for point in self.map[1:]:
-            if point.x > right.x:
-                right = point
-        return right
-
-    @property
-    def bottom(self):
-        bottom = self.map[0]
-        for point in self.map[1:]:
-            if point.y < bottom.y:
-                bottom = point
-        return bottom
-
-    @property
-    def top(self):
-        top = self.map[0]
-        for point in self.map[1:]:
-            if point.y > top.y:
-                top = point
-        return top
-
-    def move(self, vector: Point):
-        new_map: list[Point] = []
-        for point in self.map:
-            new_map.append(point + vector)
-        self.map = new_map
+    @cached_property
+    def height(self):
+        return max(point.y for point in self.map) + 1
+
+    def offsets(self, grid: Grid):
+        return [grid.offset(point.x, point.y) for point in self.map]
 
 
 FLAT = Block(map=[Point(0,0), Point(1, 0), Point(2, 0), Point(3, 0)])
@@ -70,55 +39,54 @@ SQUARE = Block(map=[Point(0, 0), Point(0, 1), Point(1, 0), Point(1, 1)])
 
 ORDER = [FLAT, PLUS, REV_L, LINE, SQUARE]
 
-MOVE_LEFT = Point(-1, 0)
-MOVE_RIGHT = Point(1, 0)
-MOVE_DOWN = Point(0, -1)
-MOVE_UP = Point(0, 1)
+WIDTH = 7
+AIR = 0
+ROCK = 1
 
 
 @dataclass
 class Chamber:
-    map: set[Point]
-    WALL_LEFT = -1
-    WALL_RIGHT = 7
-    GROUND = -1
+    jets: str
+    grid: Grid = field(default_factory=lambda: Grid(WIDTH, 64, fill=AIR, border=ROCK))
     top_y = -1
 
+    def __post_init__(self):
+        self.shapes = [block.offsets(self.grid) for block in ORDER]
+        self.jet_moves = [self.grid.offset(1 if jet == '>' else -1, 0) for jet in self.jets]
+        self.move_down = self.grid.offset(0, -1)
+
+    def drop(self, shape_step: int, jet_step: int):
+        pos = self.init_block()
+        shape = self.shapes[shape_step]
+        jet_moves = self.jet_moves
+        down = self.move_down
+        while True:
+            jet = jet_moves[jet_step]
+            jet_step = (jet_step + 1) % len(jet_moves)
+            if not self.is_collision(shape, pos + jet):
+                pos += jet
+            if self.is_collision(shape, pos + down):
+                self.settle(shape_step, pos)
+                return jet_step
+            pos += down
+
     def run_simulation(self, rock_count=2022):
-        rocks = 0
-        block_step = 0
-        block = None
         jet_step = 0
-        while rocks < rock_count:
-            if block is None:
-                block = ORDER[block_step]
-                block_step = (block_step + 1) % len(ORDER)
-                self.init_block(block)
-            jet_dir = raw[jet_step]
-            jet = MOVE_RIGHT if jet_dir == '>' else MOVE_LEFT
-            jet_step = (jet_step + 1) % len(raw)
-            block.move(jet)
-            if self.is_collision(block):
-                block.move(Point(0, 0) - jet)
-            block.move(MOVE_DOWN)
-            if self.is_collision(block):
-                block.move(MOVE_UP)
-                for point in block.map:
-                    self.map.add(point)
-                self.top_y = max(self.top_y, block.top.y)
-                block = None
-                rocks += 1
+        for rocks in range(rock_count):
+            jet_step = self.drop(rocks % len(ORDER), jet_step)
 
     def get_big_rocks(self, rock_count=1_000_000_000_000):
         rocks = 0
         block_step = 0
-        block = None
+        shape = None
+        pos = 0
         jet_step = 0
         last_height = 0
         last_rocks = 0
         cycle = dy_first = drock_first = offset_height = height_after_cycles = 0
         rocks_remaining = None
         end_rock_count = 0
+        down = self.move_down
         while True:
             if jet_step == 0:
                 new_height = self.top_y + 1
@@ -140,57 +108,56 @@ class Chamber:
                     offset_height = new_height
                     end_rock_count = 0
                 cycle += 1
-            if block is None:
-                block = ORDER[block_step]
+            if shape is None:
+                shape_step = block_step
+                shape = self.shapes[block_step]
                 block_step = (block_step + 1) % len(ORDER)
-                self.init_block(block)
-            jet_dir = raw[jet_step]
-            jet = MOVE_RIGHT if jet_dir == '>' else MOVE_LEFT
-            jet_step = (jet_step + 1) % len(raw)
-            block.move(jet)
-            if self.is_collision(block):
-                block.move(Point(0, 0) - jet)
-            block.move(MOVE_DOWN)
-            if self.is_collision(block):
-                block.move(MOVE_UP)
-                for point in block.map:
-                    self.map.add(point)
-                self.top_y = max(self.top_y, block.top.y)
-                block = None
+                pos = self.init_block()
+            jet = self.jet_moves[jet_step]
+            jet_step = (jet_step + 1) % len(self.jet_moves)
+            if not self.is_collision(shape, pos + jet):
+                pos += jet
+            if self.is_collision(shape, pos + down):
+                self.settle(shape_step, pos)
+                shape = None
                 rocks += 1
                 end_rock_count += 1
                 if end_rock_count == rocks_remaining:
                     height_change = (self.top_y + 1) - offset_height
                     return height_change + height_after_cycles
+            else:
+                pos += down
 
-    def is_collision(self, block: Block):
-        if block.left.x <= self.WALL_LEFT:
-            return True
-        if block.right.x >= self.WALL_RIGHT:
-            return True
-        if block.bottom.y <= self.GROUND:
-            return True
-        for point in block.map:
-            if point in self.map:
+    def is_collision(self, shape: list[int], pos: int):
+        cells = self.grid.cells
+        for offset in shape:
+            if cells[pos + offset] != AIR:
                 return True
         return False
 
-    def init_block(self, block: Block):
-        left = block.left
-        xpoint = Point(2, left.y) - left
-        bottom = block.bottom
-        ypoint = Point(bottom.x, self.top_y + 4) - bottom
-        move = xpoint + ypoint
-        block.move(move)
-
-    def draw_map(self, block: Block | None):
-        top_y = self.top_y + 5
+    def settle(self, shape_step: int, pos: int):
+        cells = self.grid.cells
+        for offset in self.shapes[shape_step]:
+            cells[pos + offset] = ROCK
+        top = self.grid.point(pos)[1] + ORDER[shape_step].height - 1
+        self.top_y = max(self.top_y, top)
+
+    def init_block(self):
+        needed = self.top_y + 8 - self.grid.height
+        if needed > 0:
+            self.grid.add_rows(max(needed, self.grid.height))
+        return self.grid.index(2, self.top_y + 4)
+
+    def draw_map(self, shape_step: int | None = None, pos: int | None = None):
+        falling = set()
+        if shape_step is not None and pos is not None:
+            falling = {pos + offset for offset in self.shapes[shape_step]}
         rows = []
-        for y in range(top_y + 1, self.GROUND, -1):
+        for y in range(min(self.top_y + 6, self.grid.height - 1), -1, -1):
             row = []
-            for x in range(0, self.WALL_RIGHT):
-                point = Point(x, y)
-                if point in self.map or (block is not None and point in block.map):
+            for x in range(WIDTH):
+                index = self.grid.index(x, y)
+                if self.grid[index] == ROCK or index in falling:
                     row.append('#')
                 else:
                     row.append('.')
@@ -199,10 +166,21 @@ class Chamber:
         print('\n-------------------\n')
 
 
-chamber = Chamber(set())
-chamber.run_simulation(2022)
-print(chamber.top_y + 1)
+def part1(raw: str):
+    chamber = Chamber(raw.strip())
+    chamber.run_simulation(2022)
+    return chamber.top_y + 1
+
+
+def part2(raw: str):
+    chamber = Chamber(raw.strip())
+    return chamber.get_big_rocks()
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
 
-chamber = Chamber(set())
-out = chamber.get_big_rocks()
-print(out)
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
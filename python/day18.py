@@ -3,7 +3,6 @@ from pathlib import Path
 from dataclasses import dataclass, field
 
 file = Path(__file__).parent.parent / "data" / "day18.txt"
-raw = file.read_text().strip()
 
 ADJ = [
     (1, 0, 0),
@@ -147,6 +146,18 @@ class Space:
         return flooded
 
 
-space = Space.parse(raw)
-print(space.surface_area())
-print(space.external_surface_area())
+def part1(raw: str):
+    return Space.parse(raw.strip()).surface_area()
+
+
+def part2(raw: str):
+    return Space.parse(raw.strip()).external_surface_area()
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
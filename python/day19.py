@@ -5,7 +5,6 @@ from typing import NotRequired, TypedDict
 from math import prod
 
 file = Path(__file__).parent.parent / "data" / "day19.txt"
-raw = file.read_text().strip()
 
 
 class Resources(TypedDict):
@@ -129,7 +128,6 @@ class Factory:
             if item.minute == minutes + 1:
                 if item.resources.get("geode", 0) > top:
                     top = item.resources.get("geode", 0)
-                    print(f'{top=}')
                 continue
             for buildable in item.buildable(self.bp):
                 stack.append(buildable)
@@ -153,7 +151,7 @@ def parse(data: str):
     return factories
 
 
-def part1():
+def part1(raw: str):
     factories = parse(raw)
     quality_levels = []
     for i, factory in enumerate(factories, start=1):
@@ -161,7 +159,7 @@ def part1():
         quality_levels.append(i * out)
     return sum(quality_levels)
 
-def part2():
+def part2(raw: str):
     factories = parse(raw)
     geodes = []
     for factory in factories[:3]:
@@ -169,5 +167,11 @@ def part2():
         geodes.append(out)
     return prod(geodes)
 
-print(f'{part1()=}')
-print(f'{part2()=}')
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    raw = file.read_text()
+    print(f'{part1(raw)=}')
+    print(f'{part2(raw)=}')
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Self
 
 file = Path(__file__).parent.parent / "data" / "day20.txt"
-raw = file.read_text().strip()
+KEY = 811589153
 
 
 @dataclass
@@ -96,7 +96,7 @@ class Link:
 
 
 def get_root(data: str, encryption_key=1):
-    values = [int(x) * encryption_key for x in data.splitlines()]
+    values = [int(x) * encryption_key for x in data.strip().splitlines()]
     root = Link(value=values[0])
     node = root
     link = None
@@ -109,12 +109,22 @@ def get_root(data: str, encryption_key=1):
     return root
 
 
-root = get_root(raw)
-node = root
-root.mix()
-print(root.grove_coordinates())
+def part1(raw: str):
+    root = get_root(raw)
+    root.mix()
+    return root.grove_coordinates()
 
-KEY = 811589153
-root = get_root(raw, encryption_key=KEY)
-root.mix(10)
-print(root.grove_coordinates())
+
+def part2(raw: str):
+    root = get_root(raw, encryption_key=KEY)
+    root.mix(10)
+    return root.grove_coordinates()
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    for answer in solve(file.read_text()):
+        print(answer)
@@ -1,11 +1,10 @@
 from pathlib import Path
 from dataclasses import dataclass, field
 import re
-from sympy import Symbol, solve
+from sympy import Symbol, solve as solve_equation
 import operator
 
 file = Path(__file__).parent.parent / "data" / "day21.txt"
-raw = file.read_text().strip()
 
 
 @dataclass
@@ -62,7 +61,7 @@ class MonkeyGroup:
 
 def get_monkeys(data: str):
     monkeys: dict[str, Monkey] = {}
-    for line in data.splitlines():
+    for line in data.strip().splitlines():
         monkey, expr = line.split(':')
         expr = expr.strip()
         monkeys[monkey] = Monkey(monkey, expr)
@@ -70,18 +69,24 @@ def get_monkeys(data: str):
     return mg
 
 
-def part1():
+def part1(raw: str):
     group = get_monkeys(raw)
     root_val = group.evaluate('root')
     return root_val
 
-def part2():
+def part2(raw: str):
     group = get_monkeys(raw)
     root = group.monkeys['root']
     root.expr = root.expr.replace('+', '-')
     root_val = group.expand('root')
-    value = int(solve(root_val, group.expand_cache['humn'])[0])
+    value = int(solve_equation(root_val, group.expand_cache['humn'])[0])
     return value
 
-print(f'{part1()=}')
-print(f'{part2()=}')
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    raw = file.read_text()
+    print(f'{part1(raw)=}')
+    print(f'{part2(raw)=}')
@@ -3,11 +3,11 @@ from pathlib import Path
 from dataclasses import dataclass
 import re
 from typing import Self
+from functools import cached_property
 
-from sympy.core.cache import cached_property
+from grid import Grid
 
 file = Path(__file__).parent.parent / "data" / "day22.txt"
-raw = file.read_text()
 
 
 class Space(Enum):
@@ -33,15 +33,16 @@ class Point:
         return Point(x=self.x - x, y=self.y - y)
 
 
-MapType = dict[Point, Space]
+OPEN = ord(Space.OPEN.value)
+ABYSS = ord(Space.ABYSS.value)
 
 
 @dataclass
 class Jungle:
-    map: MapType
+    map: Grid
     row_ranges: dict[int, tuple[int, int]]
     col_ranges: dict[int, tuple[int, int]]
-    start: Point
+    start: int
     instructions: list[tuple[str, int]]
     data: str
 
@@ -65,14 +66,7 @@ class Jungle:
     @classmethod
     def parse(cls, raw_data: str):
         data, instr = raw_data.split("\n\n")
-        m: MapType = {}
-        for y, row in enumerate(data.splitlines()):
-            for x, ch in enumerate(row):
-                match ch:
-                    case Space.WALL.value:
-                        m[Point(x, y)] = Space.WALL
-                    case Space.OPEN.value:
-                        m[Point(x, y)] = Space.OPEN
+        m = Grid.parse(data, border=ABYSS)
         row_ranges, col_ranges = cls.get_ranges(data)
         instrs = [
             (direction, int(count))
@@ -82,32 +76,33 @@ class Jungle:
             map=m,
             row_ranges=row_ranges,
             col_ranges=col_ranges,
-            start=Point(row_ranges[0][0], 0),
+            start=m.index(row_ranges[0][0], 0),
             instructions=instrs,
             data=data,
         )
 
     def do_instructions(self):
+        grid = self.map
+        cells = grid.cells
+        moves = [grid.offset(dx, dy) for dx, dy in DIRECTIONS]
         pos = self.start
         facing = 0
-        visited: set[Point] = {pos}
         for turn, count in self.instructions:
             if turn and turn in 'RL':
                 d_facing = -1 if turn == 'L' else 1
                 facing = (facing + d_facing) % len(DIRECTIONS)
-            move = DIRECTIONS[facing]
             for _ in range(count):
-                move = DIRECTIONS[facing]
-                npos = pos + move
+                npos = pos + moves[facing]
                 nfacing = facing
-                if self.map.get(npos, Space.ABYSS) == Space.ABYSS:
-                    npos, nfacing = self.get_connection(npos, facing)
-                if self.map.get(npos, Space.WALL) == Space.WALL:
+                if cells[npos] == ABYSS:
+                    wrap, nfacing = self.get_connection(Point(*grid.point(npos)), facing)
+                    npos = grid.index(wrap.x, wrap.y)
+                if cells[npos] != OPEN:
                     break
                 pos = npos
                 facing = nfacing
-                visited.add(pos)
-        password = (1000 * (pos.y + 1)) + (4 * (pos.x + 1)) + facing
+        x, y = grid.point(pos)
+        password = (1000 * (y + 1)) + (4 * (x + 1)) + facing
         return password
 
     def get_connection(self, pos: Point, facing: int):
@@ -127,19 +122,18 @@ class Jungle:
         npos = Point(x=wrap[0], y=wrap[1])
         return npos, facing
 
-    def draw(self, pos: Point, visited: set[Point]):
-        xmax = max(x[1] for x in self.row_ranges.values())
-        ymax = max(x[1] for x in self.col_ranges.values())
+    def draw(self, pos: int, visited: set[int]):
         rows = []
-        for y in range(ymax + 1):
+        for y in range(self.map.height):
             row = []
-            for x in range(xmax + 1):
-                if x == pos.x and y == pos.y:
+            for x in range(self.map.width):
+                index = self.map.index(x, y)
+                if index == pos:
                     row.append('o')
-                elif Point(x, y) in visited:
+                elif index in visited:
                     row.append('x')
                 else:
-                    row.append(self.map.get(Point(x, y), Space.ABYSS).value)
+                    row.append(chr(self.map[index]))
             rows.append(''.join(row))
         return '\n'.join(rows)
 
@@ -242,10 +236,19 @@ class JungleCube(Jungle):
         y = pos.y // size
         return (y * 3) + x
 
-jungle = Jungle.parse(raw)
-password = jungle.do_instructions()
-print(f'Part1: {password}')
+def part1(raw: str):
+    return Jungle.parse(raw).do_instructions()
+
+
+def part2(raw: str):
+    return JungleCube.parse(raw).do_instructions()
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
 
-jc = JungleCube.parse(raw)
-password = jc.do_instructions()
-print(f'Part2: {password}')
+if __name__ == "__main__":
+    raw = file.read_text()
+    print(f'Part1: {part1(raw)}')
+    print(f'Part2: {part2(raw)}')
@@ -1,82 +1,83 @@
 from collections import defaultdict
-from itertools import count, product
+from itertools import count
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Self
 
-
-file = Path(__file__).parent.parent / "data" / "day23.txt"
-raw = file.read_text()
-
-
-BIG = 10000000000
-SMALL = -10000000000
+from grid import Grid
 
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
-
-    def __add__(self, other: Self | tuple[int, int]):
-        x, y = other if isinstance(other, tuple) else (other.x, other.y)
-        return Point(x=self.x + x, y=self.y + y)
-
-    def __sub__(self, other: Self | tuple[int, int]):
-        x, y = other if isinstance(other, tuple) else (other.x, other.y)
-        return Point(x=self.x - x, y=self.y - y)
+file = Path(__file__).parent.parent / "data" / "day23.txt"
 
 
 MOVES = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-ADJ = list(product((1, -1, 0), repeat=2))
-ADJ.remove((0, 0))
+
+GROUND = 0
+ELF = 1
+MARGIN = 16
 
 
 @dataclass
 class Crater:
-    map: set[Point]
+    map: Grid
+    elves: list[int]
     moves: list[tuple[int, int]] = field(default_factory=lambda: MOVES[:], repr=False)
 
     @classmethod
     def parse(cls, data: str):
-        m = set()
-        for y, row in enumerate(data.splitlines()):
-            for x, ch in enumerate(row):
-                if ch == '#':
-                    m.add(Point(x, y))
-        return cls(map=m)
-
-    def is_all_adj_open(self, point: Point):
-        for move in ADJ:
-            npos = point + move
-            if npos in self.map:
+        grid = Grid.parse(data, border=GROUND, pad=MARGIN, table=bytes.maketrans(b'.#', bytes([GROUND, ELF])))
+        return cls(map=grid, elves=list(grid.indices(ELF)))
+
+    def grow(self):
+        old = self.map
+        grid = Grid(old.width + 2 * MARGIN, old.height + 2 * MARGIN, fill=GROUND, pad=MARGIN)
+        shift = grid.offset(MARGIN, MARGIN)
+        for y in range(-old.pad, old.height + old.pad):
+            start = old.index(-old.pad, y)
+            dest = grid.index(-old.pad, y) + shift
+            grid.cells[dest:dest + old.stride] = old.cells[start:start + old.stride]
+        self.elves = [grid.index(*old.point(elf)) + shift for elf in self.elves]
+        self.map = grid
+
+    def is_all_adj_open(self, point: int):
+        cells = self.map.cells
+        for move in self.map.adj8:
+            if cells[point + move]:
                 return False
         return True
 
+    def checks(self):
+        for dx, dy in self.moves:
+            move = self.map.offset(dx, dy)
+            if dx:
+                sides = [self.map.offset(dx, i) for i in (-1, 0, 1)]
+            else:
+                sides = [self.map.offset(i, dy) for i in (-1, 0, 1)]
+            yield move, sides
+
     def step(self):
-        considerations: dict[Point, list[Point]] = defaultdict(list)
+        cells = self.map.cells
+        checks = list(self.checks())
+        considerations: dict[int, list[int]] = defaultdict(list)
         moves = 0
-        for point in self.map:
+        for point in self.elves:
             if self.is_all_adj_open(point):
                 continue
 
-            for move in self.moves:
-                idx = move.index(0)
-                is_open = True
-                for i in (-1, 0, 1):
-                    nmove = list(move[:])
-                    nmove[idx] = i
-                    npos = point + tuple(nmove)
-                    if npos in self.map:
-                        is_open = False
-                if is_open:
+            for move, (a, b, c) in checks:
+                if not (cells[point + a] or cells[point + b] or cells[point + c]):
                     considerations[point + move].append(point)
                     break
+        moved: dict[int, int] = {}
         for point, considered_by in considerations.items():
             if len(considered_by) == 1:
-                self.map.add(point)
-                self.map.remove(considered_by[0])
+                cells[point] = ELF
+                cells[considered_by[0]] = GROUND
+                moved[considered_by[0]] = point
                 moves += 1
+        if moved:
+            self.elves = [moved.get(elf, elf) for elf in self.elves]
+            if not all(self.map.contains(point) for point in moved.values()):
+                self.grow()
         x = self.moves.pop(0)
         self.moves.append(x)
         return moves
@@ -92,21 +93,17 @@ class Crater:
                 return i
 
     def get_edges(self):
-        minx = miny = BIG
-        maxx = maxy = SMALL
-        for point in self.map:
-            minx = min(minx, point.x)
-            maxx = max(maxx, point.x)
-            miny = min(miny, point.y)
-            maxy = max(maxy, point.y)
-        return minx, maxx, miny, maxy
+        points = [self.map.point(elf) for elf in self.elves]
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return min(xs), max(xs), min(ys), max(ys)
 
     def count_ground(self):
         minx, maxx, miny, maxy = self.get_edges()
         dx = maxx - minx + 1
         dy = maxy - miny + 1
         total = dx * dy
-        ground = total - len(self.map)
+        ground = total - len(self.elves)
         return ground
 
     def draw(self):
@@ -115,7 +112,7 @@ class Crater:
         for y in range(miny, maxy + 1):
             row = []
             for x in range(minx, maxx + 1):
-                if Point(x, y) in self.map:
+                if self.map[self.map.index(x, y)] == ELF:
                     row.append('#')
                 else:
                     row.append('.')
@@ -123,11 +120,22 @@ class Crater:
         print('\n'.join(rows))
 
 
-crater = Crater.parse(raw)
-crater.steps(10)
-ground = crater.count_ground()
-print(f'Part1: {ground}')
+def part1(raw: str):
+    crater = Crater.parse(raw)
+    crater.steps(10)
+    return crater.count_ground()
+
+
+def part2(raw: str):
+    crater = Crater.parse(raw)
+    return crater.until_frozen()
+
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
 
-crater = Crater.parse(raw)
-move = crater.until_frozen()
-print(f'Part2: {move}')
+if __name__ == "__main__":
+    raw = file.read_text()
+    print(f'Part1: {part1(raw)}')
+    print(f'Part2: {part2(raw)}')
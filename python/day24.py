@@ -1,13 +1,14 @@
 from functools import cached_property
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Literal, Self
+from typing import Literal
 from queue import PriorityQueue
 from math import lcm
 
+from grid import Grid
+
 
 file = Path(__file__).parent.parent / "data" / "day24.txt"
-raw = file.read_text()
 
 OPEN = "."
 WALL = "#"
@@ -20,65 +21,63 @@ BLIZZARDS: dict[Literal["^", ">", "<", "v"], tuple[int, int]] = {
 }
 
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
-
-    def __add__(self, other: Self | tuple[int, int]):
-        x, y = other if isinstance(other, tuple) else (other.x, other.y)
-        return Point(x=self.x + x, y=self.y + y)
-
-    def __sub__(self, other: Self | tuple[int, int]):
-        x, y = other if isinstance(other, tuple) else (other.x, other.y)
-        return Point(x=self.x - x, y=self.y - y)
+BLIZZARD_CHARS = "".join(BLIZZARDS).encode()
+CLEAR = bytes.maketrans(BLIZZARD_CHARS, OPEN.encode() * len(BLIZZARDS))
 
 
 @dataclass(order=True)
 class Item:
     heuristic: int
     t: int
-    pos: Point = field(compare=False)
+    pos: int = field(compare=False)
 
 
 @dataclass(frozen=True)
 class Basin:
-    map: dict[Point, str] = field(hash=False)
-    start: Point
-    end: Point
+    map: Grid = field(hash=False)
+    start: int
+    end: int
     x_length: int
     y_length: int
-    map_cache: dict[int, dict[Point, str]] = field(default_factory=dict)
+    blizzards: list[tuple[int, int, str]] = field(hash=False)
+    map_cache: dict[int, bytearray] = field(default_factory=dict)
 
     @classmethod
     def parse(cls, data: str):
-        m = {}
-        start = None
-        end = None
         lines = data.splitlines()
         x_length = len(lines[0]) - 2
         y_length = len(lines) - 2
-        for y, row in enumerate(lines):
-            y = y - 1
-            for x, ch in enumerate(row):
-                x = x - 1
-                if ch in ".^v<>":
-                    m[Point(x, y)] = ch
-                    if y == -1:
-                        if ch == ".":
-                            start = Point(x, y)
-                    elif y == y_length:
-                        if ch == ".":
-                            end = Point(x, y)
-        assert start and end
-        return cls(map=m, start=start, x_length=x_length, y_length=y_length, end=end)
+        grid = Grid.parse(data, border=ord(WALL))
+        start = grid.index(lines[0].index(OPEN), 0)
+        end = grid.index(lines[-1].index(OPEN), len(lines) - 1)
+        blizzards = [
+            (x - 1, y - 1, ch)
+            for y, row in enumerate(lines)
+            for x, ch in enumerate(row)
+            if ch in BLIZZARDS
+        ]
+        grid.cells = grid.cells.translate(CLEAR)
+        return cls(
+            map=grid,
+            start=start,
+            x_length=x_length,
+            y_length=y_length,
+            end=end,
+            blizzards=blizzards,
+        )
 
     @cached_property
     def tmod(self):
         return lcm(self.x_length, self.y_length)
 
-    def dist(self, pos: Point):
-        return abs(pos.x - self.end.x) + abs(pos.y - self.end.y)
+    @cached_property
+    def moves(self):
+        return [self.map.offset(dx, dy) for dx, dy in BLIZZARDS.values()]
+
+    def dist(self, pos: int):
+        x, y = self.map.point(pos)
+        end_x, end_y = self.map.point(self.end)
+        return abs(x - end_x) + abs(y - end_y)
 
     def back_and_forth(self):
         t1 = self.traverse(self.start, self.end)
@@ -86,12 +85,14 @@ class Basin:
         t3 = self.traverse(self.start, self.end, init_t=t2)
         return t3
 
-    def traverse(self, start: Point, end: Point, init_t=0):
+    def traverse(self, start: int, end: int, init_t=0):
+        cells = self.map.cells
+        wall = ord(WALL)
         queue: PriorityQueue[Item] = PriorityQueue()
         queue.put(Item(heuristic=self.dist(start), t=init_t, pos=start))
         min_t = float("inf")
         out = None
-        visited: dict[tuple[Point, int], int] = {}
+        visited: dict[tuple[int, int], int] = {}
         while not queue.empty():
             item = queue.get()
             heur, t, pos = item.heuristic, item.t, item.pos
@@ -103,7 +104,7 @@ class Basin:
                 visited[key] = t
 
             m = self.calculate_map(t)
-            if m[pos] in BLIZZARDS.keys():
+            if m[pos] in BLIZZARD_CHARS:
                 continue
 
             if heur >= min_t:
@@ -117,20 +118,20 @@ class Basin:
 
             nt = t + 1
             queue.put(Item(heuristic=heur + 1, t=nt, pos=pos))
-            for adj in BLIZZARDS.values():
+            for adj in self.moves:
                 npos = pos + adj
-                if npos in self.map:
+                if cells[npos] != wall:
                     queue.put(Item(heuristic=nt + self.dist(npos), t=nt, pos=npos))
         assert out
         return out
 
-    def draw(self, pos: Point, t: int):
+    def draw(self, pos: int, t: int):
         m = self.calculate_map(t)
         rows = []
-        for y in range(-1, self.y_length + 1):
+        for y in range(self.map.height):
             row = []
-            for x in range(-1, self.x_length + 1):
-                point = Point(x, y)
+            for x in range(self.map.width):
+                point = self.map.index(x, y)
                 if pos == point:
                     row.append("O")
                 elif point == self.end:
@@ -138,11 +139,11 @@ class Basin:
                 elif point == self.start:
                     row.append("S")
                 else:
-                    row.append(m.get(point, WALL))
+                    row.append(chr(m[point]))
             rows.append("".join(row))
         print("\n".join(rows))
 
-    def draw_path(self, moves: list[Point]):
+    def draw_path(self, moves: list[int]):
         for t, pos in enumerate(moves):
             self.draw(pos, t)
             input()
@@ -151,38 +152,33 @@ class Basin:
         t = t % self.tmod
         if ret := self.map_cache.get(t, None):
             return ret
-        m: dict[Point, str] = {}
-        for point, val in self.map.items():
-            if val in "<>v^.":
-                m[point] = "."
-        for point, val in self.map.items():
-            if move := BLIZZARDS.get(val, None):  # type: ignore
-                idx = (move.index(0) + 1) % 2
-                if idx == 0:
-                    x0 = point.x
-                    y = point.y
-                    x = ((move[idx] * t) + x0) % self.x_length
-                else:
-                    y0 = point.y
-                    x = point.x
-                    y = ((move[idx] * t) + y0) % self.y_length
-                npoint = Point(x, y)
-                m[npoint] = val
+        m = self.map.cells[:]
+        for x0, y0, val in self.blizzards:
+            dx, dy = BLIZZARDS[val]  # type: ignore
+            x = ((dx * t) + x0) % self.x_length
+            y = ((dy * t) + y0) % self.y_length
+            m[self.map.index(x + 1, y + 1)] = ord(val)
         self.map_cache[t] = m
         return m
 
 
-def part1():
+def part1(raw: str):
     basin = Basin.parse(raw)
     t = basin.traverse(basin.start, basin.end)
     return t
 
 
-def part2():
+def part2(raw: str):
     basin = Basin.parse(raw)
     t = basin.back_and_forth()
     return t
 
 
-print(f'{part1()=}')
-print(f"{part2()=}")
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    raw = file.read_text()
+    print(f'{part1(raw)=}')
+    print(f"{part2(raw)=}")
@@ -1,7 +1,6 @@
 from pathlib import Path
 
 file = Path(__file__).parent.parent / "data" / "day25.txt"
-raw = file.read_text()
 
 class Snafu:
     def __init__(self, value: str|list[str]) -> None:
@@ -67,10 +66,19 @@ def get_nums(data: str):
         nums.append(n)
     return nums
 
-def part1():
+def part1(raw: str):
     nums = get_nums(raw)
     out = sum(x.value for x in nums)
     x = Snafu.find(out)
     return x
 
-print(f'{part1()=}')
+def part2(raw: str):
+    return None
+
+def solve(raw: str):
+    return part1(raw), part2(raw)
+
+
+if __name__ == "__main__":
+    raw = file.read_text()
+    print(f'{part1(raw)=}')
@@ -0,0 +1,514 @@
+"""Seeded generators for synthetic puzzle inputs of any size.
+
+    python generate.py 15 1000             # 1000 sensors for day 15
+    python generate.py 8 2000 -s 7 -o big  # a 2000x2000 forest, seed 7
+
+The same day, size and seed always produce the same input.
+"""
+from argparse import ArgumentParser
+from itertools import product
+from math import lcm
+from pathlib import Path
+from random import Random
+from string import ascii_letters, ascii_lowercase, ascii_uppercase
+from typing import Callable
+import sys
+
+Generator = Callable[[Random, int], str]
+
+
+def day01(rng: Random, size: int):
+    """`size` elves carrying 1-15 snacks each."""
+    elves = []
+    for _ in range(size):
+        elves.append('\n'.join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15))))
+    return '\n\n'.join(elves)
+
+
+def day02(rng: Random, size: int):
+    """`size` rounds of rock paper scissors."""
+    return '\n'.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}' for _ in range(size))
+
+
+def day03(rng: Random, size: int, half=12):
+    """`size` groups of three rucksacks (3 * size lines)."""
+    lines = []
+    for _ in range(size):
+        letters = list(ascii_letters)
+        rng.shuffle(letters)
+        badge = letters.pop()
+        for k in range(3):
+            own = letters[k * 17:(k + 1) * 17]
+            common, left_pool, right_pool = own[0], own[1:9], own[9:]
+            left = [badge, common] + rng.choices(left_pool, k=half - 2)
+            right = [common] + rng.choices(right_pool, k=half - 1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            lines.append(''.join(left + right))
+    return '\n'.join(lines)
+
+
+def day04(rng: Random, size: int, width=100):
+    """`size` pairs of section assignments inside 1..width."""
+    lines = []
+    for _ in range(size):
+        a, b = sorted(rng.randint(1, width) for _ in range(2))
+        c, d = sorted(rng.randint(1, width) for _ in range(2))
+        lines.append(f'{a}-{b},{c}-{d}')
+    return '\n'.join(lines)
+
+
+def day05(rng: Random, size: int, stacks=9):
+    """`size` crane moves over 9 stacks of about size // 10 crates."""
+    height = max(size // 10, 2)
+    crates = [[rng.choice(ascii_uppercase) for _ in range(rng.randint(2, height))] for _ in range(stacks)]
+    tallest = max(map(len, crates))
+    rows = []
+    for y in range(tallest - 1, -1, -1):
+        rows.append(' '.join(f'[{stack[y]}]' if y < len(stack) else '   ' for stack in crates))
+    rows.append(' '.join(f' {i} ' for i in range(1, stacks + 1)))
+    moves = []
+    for _ in range(size):
+        start = rng.choice([i for i, stack in enumerate(crates) if len(stack) > 1])
+        end = rng.choice([i for i in range(stacks) if i != start])
+        count = rng.randint(1, len(crates[start]) - 1)
+        crates[end].extend(crates[start][-count:])
+        del crates[start][-count:]
+        moves.append(f'move {count} from {start + 1} to {end + 1}')
+    return '\n'.join(rows) + '\n\n' + '\n'.join(moves)
+
+
+def day06(rng: Random, size: int):
+    """A `size` character signal whose markers are at the very end."""
+    noise = ''.join(rng.choice('abc') for _ in range(size))
+    marker = list(ascii_lowercase[3:17])
+    rng.shuffle(marker)
+    return noise + ''.join(marker)
+
+
+def day07(rng: Random, size: int, width=5):
+    """A terminal session listing about `size` files and directories."""
+    lines = ['$ cd /']
+    count = 0
+
+    def list_dir():
+        nonlocal count
+        lines.append('$ ls')
+        subdirs = rng.randint(0, width) if count else width
+        dirs = [] if count >= size else [f'd{count + i}' for i in range(subdirs)]
+        files = rng.randint(1, width)
+        lines.extend(f'dir {name}' for name in dirs)
+        lines.extend(f'{rng.randint(1000, 300000)} f{count}.{i}' for i in range(files))
+        count += len(dirs) + files
+        return iter(dirs)
+
+    stack = [list_dir()]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            if stack:
+                lines.append('$ cd ..')
+            continue
+        lines.append(f'$ cd {child}')
+        stack.append(list_dir())
+    return '\n'.join(lines)
+
+
+def day08(rng: Random, size: int):
+    """A `size` x `size` forest."""
+    return '\n'.join(''.join(rng.choice('0123456789') for _ in range(size)) for _ in range(size))
+
+
+def day09(rng: Random, size: int, max_step=20):
+    """`size` rope moves of up to `max_step` steps."""
+    return '\n'.join(f'{rng.choice("UDLR")} {rng.randint(1, max_step)}' for _ in range(size))
+
+
+def day10(rng: Random, size: int):
+    """`size` cpu instructions (at least enough for 240 cycles)."""
+    lines = []
+    x = 1
+    for _ in range(max(size, 240)):
+        if rng.random() < 0.3:
+            lines.append('noop')
+        else:
+            value = rng.randint(-10, 10)
+            if not 0 <= x + value < 40:
+                value = -value
+            x += value
+            lines.append(f'addx {value}')
+    return '\n'.join(lines)
+
+
+def day11(rng: Random, size: int, monkeys=8):
+    """8 monkeys starting with `size` items between them (at least one each)."""
+    tests = [2, 3, 5, 7, 11, 13, 17, 19]
+    rng.shuffle(tests)
+    items: list[list[int]] = [[] for _ in range(monkeys)]
+    for i in range(max(size, monkeys)):
+        holder = i if i < monkeys else rng.randrange(monkeys)
+        items[holder].append(rng.randint(50, 99))
+    operations = ['old * old'] + [f'old * {rng.randint(2, 19)}'] + [f'old + {rng.randint(1, 8)}' for _ in range(monkeys - 2)]
+    rng.shuffle(operations)
+    blocks = []
+    for i in range(monkeys):
+        if_true, if_false = rng.sample([x for x in range(monkeys) if x != i], 2)
+        blocks.append('\n'.join([
+            f'Monkey {i}:',
+            f'  Starting items: {", ".join(map(str, items[i]))}',
+            f'  Operation: new = {operations[i]}',
+            f'  Test: divisible by {tests[i % len(tests)]}',
+            f'    If true: throw to monkey {if_true}',
+            f'    If false: throw to monkey {if_false}',
+        ]))
+    return '\n\n'.join(blocks)
+
+
+def day12(rng: Random, size: int, pits=0.01):
+    """A height map `size` tall climbing from S in one corner to E in the other.
+
+    Maps too small to climb a..z are widened until the corners are 25 steps apart.
+    """
+    height = max(size, 1)
+    width = max(size, 27 - height)
+    steps = width + height - 2
+    rows = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            # never more than one higher per step towards E
+            level = min(25, (x + y) * 25 // steps)
+            # the top row and the right column stay a climbable route
+            if y and x < width - 1 and x + y > 2 and x + y < steps - 4 and rng.random() < pits:
+                level = 0
+            row.append(ascii_lowercase[level])
+        rows.append(row)
+    rows[0][0] = 'S'
+    rows[-1][-1] = 'E'
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def _packet(rng: Random, depth: int) -> str:
+    if depth == 0 or rng.random() < 0.3:
+        return str(rng.randint(0, 10))
+    return '[' + ','.join(_packet(rng, depth - 1) for _ in range(rng.randint(0, 4))) + ']'
+
+
+def day13(rng: Random, size: int, depth=4):
+    """`size` pairs of packets nested up to `depth` lists deep."""
+    pairs = []
+    for _ in range(size):
+        pair = []
+        for _ in range(2):
+            pair.append('[' + ','.join(_packet(rng, depth - 1) for _ in range(rng.randint(0, 5))) + ']')
+        pairs.append('\n'.join(pair))
+    return '\n\n'.join(pairs)
+
+
+def day14(rng: Random, size: int):
+    """`size` rock paths scattered under the sand source."""
+    spread = max(size, 10)
+    depth = max(size // 2, 10)
+    lines = []
+    for _ in range(size):
+        x = 500 + rng.randint(-spread, spread)
+        y = rng.randint(2, depth)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 4)):
+            if i % 2 == 0:
+                x += rng.randint(-8, 8) or 1
+            else:
+                y = max(1, y + rng.randint(-4, 4))
+            points.append((x, y))
+        lines.append(' -> '.join(f'{a},{b}' for a, b in points))
+    return '\n'.join(lines)
+
+
+def _beacon(rng: Random, x: int, y: int, radius: int, limit: int):
+    # a beacon `radius` away from (x, y) past the nearest edge of the search
+    # area, so no beacon lands on a cell the part 2 scan can stop at
+    edge, (ux, uy) = min((x, (-1, 0)), (limit - x, (1, 0)), (y, (0, -1)), (limit - y, (0, 1)))
+    if radius <= edge:
+        return None
+    side = rng.randint(0, radius - edge - 1) * rng.choice((-1, 1))
+    along = radius - abs(side)
+    return x + ux * along - uy * side, y + uy * along + ux * side
+
+
+def day15(rng: Random, size: int, limit=4000000):
+    """`size` sensors (at least 4) leaving exactly one uncovered cell in the 0..4000000 square."""
+    tx, ty = rng.randint(0, limit), rng.randint(0, limit)
+    sensors: list[tuple[int, int, int, int]] = []
+
+    # one sensor per quadrant around the distress beacon, diagonally past the
+    # square's edge: (tx + sx * k, ty + sy * j) is 2a - k - j away from it, so
+    # a reach of 2a - 1 covers the whole quadrant except the distress cell
+    for sx, sy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+        a = max(limit - tx if sx > 0 else tx, limit - ty if sy > 0 else ty) + 1
+        x, y = tx + sx * a, ty + sy * a
+        sensors.append((x, y, x + sx * (2 * a - 1), y))
+
+    # the rest are decoys that always stop short of the distress cell
+    reach = max(limit // max(int(size ** 0.5), 1), 1)
+    attempts = 0
+    while len(sensors) < size and attempts < 100 * size:
+        attempts += 1
+        x, y = rng.randint(0, limit), rng.randint(0, limit)
+        radius = min(rng.randint(reach // 2, reach), abs(x - tx) + abs(y - ty) - 1)
+        if (beacon := _beacon(rng, x, y, radius, limit)) is not None:
+            sensors.append((x, y, *beacon))
+
+    for x, y, bx, by in sensors:
+        radius = abs(x - bx) + abs(y - by)
+        assert radius < abs(x - tx) + abs(y - ty), 'a sensor covers the distress beacon'
+        assert not (0 <= bx <= limit and 0 <= by <= limit), 'a beacon inside the search area'
+    rng.shuffle(sensors)
+    return '\n'.join(
+        f'Sensor at x={x}, y={y}: closest beacon is at x={bx}, y={by}' for x, y, bx, by in sensors
+    )
+
+
+def day16(rng: Random, size: int, flowing=15):
+    """`size` valves (at most 676) in a connected tunnel network."""
+    names = [''.join(x) for x in product(ascii_uppercase, repeat=2)]
+    names.remove('AA')
+    names = ['AA'] + rng.sample(names, min(size, len(names) + 1) - 1)
+    tunnels: dict[str, set[str]] = {name: set() for name in names}
+    for i, name in enumerate(names[1:], 1):
+        other = names[rng.randrange(i)]
+        tunnels[name].add(other)
+        tunnels[other].add(name)
+    for _ in range(len(names) // 2):
+        a, b = rng.sample(names, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    rates = {name: 0 for name in names}
+    for name in rng.sample(names[1:], min(flowing, len(names) - 1)):
+        rates[name] = rng.randint(1, 25)
+    lines = []
+    for name in names:
+        to = sorted(tunnels[name])
+        plural = 's lead to valves' if len(to) > 1 else ' leads to valve'
+        lines.append(f'Valve {name} has flow rate={rates[name]}; tunnel{plural} {", ".join(to)}')
+    return '\n'.join(lines)
+
+
+def day17(rng: Random, size: int):
+    """A `size` long jet pattern."""
+    return ''.join(rng.choice('<>') for _ in range(size))
+
+
+def day18(rng: Random, size: int):
+    """A blob of `size` lava cubes."""
+    side = max(round(size ** (1 / 3) * 1.5), 2)
+    cubes: set[tuple[int, int, int]] = set()
+    while len(cubes) < min(size, side ** 3):
+        cubes.add((rng.randrange(side), rng.randrange(side), rng.randrange(side)))
+    return '\n'.join(f'{x},{y},{z}' for x, y, z in cubes)
+
+
+def day19(rng: Random, size: int):
+    """`size` blueprints."""
+    lines = []
+    for i in range(1, size + 1):
+        lines.append(
+            f'Blueprint {i}: Each ore robot costs {rng.randint(2, 4)} ore. '
+            f'Each clay robot costs {rng.randint(2, 4)} ore. '
+            f'Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. '
+            f'Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian.'
+        )
+    return '\n'.join(lines)
+
+
+def day20(rng: Random, size: int):
+    """An encrypted file of `size` numbers with a single zero."""
+    values = [rng.randint(-10000, 10000) or 1 for _ in range(max(size, 2) - 1)] + [0]
+    rng.shuffle(values)
+    return '\n'.join(map(str, values))
+
+
+def day21(rng: Random, size: int):
+    """About `size` yelling monkeys whose root depends linearly on humn."""
+    names: set[str] = {'root', 'humn'}
+    lines: list[str] = []
+
+    def new_name():
+        while (name := ''.join(rng.choices(ascii_lowercase, k=4))) in names:
+            pass
+        names.add(name)
+        return name
+
+    def build(name: str, value: int, budget: int, humn: bool) -> None:
+        if budget <= 1:
+            lines.append(f'{name}: {value}')
+            return
+        ops = ['+', '-'] if value > 10 ** 6 or value < 2 else ['+', '-', '*', '/']
+        op = rng.choice(ops)
+        if op == '*' and not (factors := [f for f in range(2, 10) if value % f == 0]):
+            op = '+'
+        if op == '+':
+            left = rng.randint(1, value - 1) if value > 1 else value + 1
+            right = value - left
+            if right <= 0:
+                op, left, right = '-', value + 1, 1
+        elif op == '-':
+            right = rng.randint(1, 100)
+            left = value + right
+        elif op == '*':
+            right = rng.choice(factors)
+            left = value // right
+        else:
+            right = rng.randint(2, 5)
+            left = value * right
+        split = rng.randint(1, budget - 1)
+        a = 'humn' if humn and split == 1 else new_name()
+        b = new_name()
+        lines.append(f'{name}: {a} {op} {b}')
+        build(a, left, split, humn)
+        build(b, right, budget - split, False)
+
+    target = rng.randint(1000, 100000)
+    budget = max(size, 4) - 1
+    split = budget // 2
+    a = 'humn' if split == 1 else new_name()
+    b = new_name()
+    lines.append(f'root: {a} + {b}')
+    build(a, target, split, True)
+    build(b, target, budget - split, False)
+    return '\n'.join(lines)
+
+
+def day22(rng: Random, size: int, walls=0.05):
+    """A cube net with faces of `size` x `size` tiles and 2 * size moves."""
+    layout = ['.##', '.#.', '##.', '#..']
+    rows = []
+    for face_row in layout:
+        for _ in range(size):
+            row = []
+            for face in face_row:
+                if face == '.':
+                    row.append(' ' * size)
+                else:
+                    row.append(''.join('#' if rng.random() < walls else '.' for _ in range(size)))
+            rows.append(''.join(row).rstrip())
+    rows[0] = ' ' * size + '.' + rows[0][size + 1:]
+    moves = ''.join(f'{rng.choice("LR")}{rng.randint(1, size)}' for _ in range(2 * size))
+    return '\n'.join(rows) + f'\n\n{rng.randint(1, size)}{moves}\n'
+
+
+def day23(rng: Random, size: int, density=0.5):
+    """A `size` x `size` grove where each tile holds an elf with probability `density` (at least one elf)."""
+    size = max(size, 1)
+    rows = [['#' if rng.random() < density else '.' for _ in range(size)] for _ in range(size)]
+    if not any('#' in row for row in rows):
+        rows[rng.randrange(size)][rng.randrange(size)] = '#'
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def _valley_route(rows: list[str]):
+    """Whether the expedition can go there, back and there again, as in part 2."""
+    width, height = len(rows[0]) - 2, len(rows) - 2
+    blizzards = [
+        (x - 1, y - 1, ch)
+        for y, row in enumerate(rows)
+        for x, ch in enumerate(row)
+        if ch in '<>^v'
+    ]
+    moves = {'<': (-1, 0), '>': (1, 0), '^': (0, -1), 'v': (0, 1)}
+    period = lcm(width, height)
+    gaps = [(0, -1), (width - 1, height)]
+
+    def earliest(start: tuple[int, int], end: tuple[int, int], t: int):
+        seen = {(start, t % period)}
+        frontier = [start]
+        while frontier:
+            t += 1
+            blocked = {
+                ((x + moves[ch][0] * t) % width, (y + moves[ch][1] * t) % height)
+                for x, y, ch in blizzards
+            }
+            following = []
+            for x, y in frontier:
+                for dx, dy in ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)):
+                    point = (x + dx, y + dy)
+                    if point == end:
+                        return t
+                    if point != start and not (0 <= point[0] < width and 0 <= point[1] < height):
+                        continue
+                    if point in blocked or (point, t % period) in seen:
+                        continue
+                    seen.add((point, t % period))
+                    following.append(point)
+            frontier = following
+        return None
+
+    t: int | None = 0
+    for leg in range(3):
+        t = earliest(gaps[leg % 2], gaps[1 - leg % 2], t)
+        if t is None:
+            return False
+    return True
+
+
+def day24(rng: Random, size: int, density=0.6, checked=20000):
+    """A valley `size` wide and size // 4 tall with blizzards on `density` of the tiles.
+
+    Valleys with at most `checked` (tile, blizzard phase) states are regenerated
+    until they have a route, bigger ones are left to chance.
+    """
+    width = max(size, 3)
+    height = max(size // 4, 3)
+    while True:
+        rows = ['#.' + '#' * width]
+        for _ in range(height):
+            row = []
+            for x in range(width):
+                if rng.random() < density:
+                    row.append(rng.choice('<>' if x in (0, width - 1) else '<>^v'))
+                else:
+                    row.append('.')
+            rows.append('#' + ''.join(row) + '#')
+        rows.append('#' * width + '.#')
+        if width * height * lcm(width, height) > checked or _valley_route(rows):
+            return '\n'.join(rows) + '\n'
+
+
+def _snafu(value: int):
+    digits = []
+    while value:
+        value, rem = divmod(value + 2, 5)
+        digits.append('=-012'[rem])
+    return ''.join(reversed(digits)) or '0'
+
+
+def day25(rng: Random, size: int):
+    """`size` SNAFU numbers."""
+    return '\n'.join(_snafu(rng.randint(1, 10 ** 12)) for _ in range(size)) + '\n'
+
+
+GENERATORS: dict[int, Generator] = {
+    int(name[3:]): func for name, func in list(globals().items()) if name.startswith('day')
+}
+
+
+def generate(day: int, size: int, seed=0):
+    return GENERATORS[day](Random(seed), size)
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('size', type=int)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=Path, default=None)
+    args = parser.parse_args(argv)
+    data = generate(args.day, args.size, seed=args.seed)
+    if args.output:
+        args.output.write_text(data)
+    else:
+        sys.stdout.write(data)
+
+
+if __name__ == '__main__':
+    main()
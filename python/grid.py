@@ -0,0 +1,94 @@
+"""A compact 2d grid for the simulation days.
+
+Cells live row-major in a single bytearray and are addressed by a flat
+integer index, so moving between cells is integer addition with one of
+the precomputed neighbour offsets instead of allocating a new point. The
+grid is surrounded by `pad` rows/columns of `border` cells, which lets a
+walk step off the edge without any bounds checks.
+"""
+from typing import Iterator
+
+
+class Grid:
+    def __init__(self, width: int, height: int, fill=0, border: int | None = None, pad=1):
+        self.width = width
+        self.height = height
+        self.pad = pad
+        self.fill = fill
+        self.border = fill if border is None else border
+        self.stride = width + 2 * pad
+        self.cells = bytearray()
+        self.cells.extend(self.edge_row() * pad)
+        self.cells.extend(self.blank_row() * height)
+        self.cells.extend(self.edge_row() * pad)
+
+        stride = self.stride
+        # east, south, west, north with y growing downwards
+        self.adj4 = (1, stride, -1, -stride)
+        self.adj8 = (
+            -stride - 1, -stride, -stride + 1,
+            -1, 1,
+            stride - 1, stride, stride + 1,
+        )
+
+    @classmethod
+    def parse(cls, data: str, border=ord(' '), pad=1, table: bytes | None = None):
+        lines = data.splitlines()
+        grid = cls(max(map(len, lines), default=0), len(lines), fill=border, pad=pad)
+        for y, line in enumerate(lines):
+            row = line.encode()
+            if table is not None:
+                row = row.translate(table)
+            start = grid.index(0, y)
+            grid.cells[start:start + len(row)] = row
+        return grid
+
+    def edge_row(self):
+        return bytes([self.border]) * self.stride
+
+    def blank_row(self):
+        side = bytes([self.border]) * self.pad
+        return side + bytes([self.fill]) * self.width + side
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.pad) * self.stride + x + self.pad
+
+    def offset(self, dx: int, dy: int) -> int:
+        return dy * self.stride + dx
+
+    def point(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - self.pad, y - self.pad
+
+    def contains(self, index: int) -> bool:
+        x, y = self.point(index)
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: int):
+        self.cells[index] = value
+
+    def __len__(self):
+        return len(self.cells)
+
+    def find(self, value: int) -> int:
+        return self.cells.find(value)
+
+    def indices(self, value: int) -> Iterator[int]:
+        cells = self.cells
+        i = cells.find(value)
+        while i != -1:
+            yield i
+            i = cells.find(value, i + 1)
+
+    def add_rows(self, count: int):
+        end = (self.height + self.pad) * self.stride
+        self.cells[end:end] = self.blank_row() * count
+        self.height += count
+
+    def rows(self) -> Iterator[bytes]:
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield bytes(self.cells[start:start + self.width])
@@ -0,0 +1,76 @@
+"""Run any subset of the days in a process pool and report per-part timings.
+
+    python run.py              # every day
+    python run.py 1 5 12       # only these days
+    python run.py -j 4 16 19   # limit the pool to 4 workers
+
+One JSON object per part is written to stdout as soon as its day finishes.
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from pathlib import Path
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+DAYS = list(range(1, 26))
+
+# the slow days are submitted first so they don't end up queued behind the rest
+SLOW_DAYS = [16, 19, 24, 11, 15, 23, 20]
+
+
+def load_day(day: int):
+    return import_module(f"day{day:02d}")
+
+
+def time_call(func, *args):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    answer = func(*args)
+    return answer, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def run_day(day: int):
+    module = load_day(day)
+    raw = module.file.read_text()
+    results = []
+    for part, func in ((1, module.part1), (2, module.part2)):
+        answer, wall, cpu = time_call(func, raw)
+        results.append({
+            "day": day,
+            "part": part,
+            "answer": answer,
+            "wall": wall,
+            "cpu": cpu,
+        })
+    return results
+
+
+def schedule(days: list[int]):
+    return sorted(days, key=lambda day: SLOW_DAYS.index(day) if day in SLOW_DAYS else len(SLOW_DAYS))
+
+
+def run_days(days: list[int], workers: int | None = None):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_day, day): day for day in schedule(days)}
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except Exception as e:
+                yield {"day": futures[future], "error": repr(e)}
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    for result in run_days(args.days, args.workers):
+        print(json.dumps(result, default=str), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Constant memory reading for the line and stream oriented days."""
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+CHUNK_SIZE = 1 << 20
+
+
+def read_chunks(source: Path | str | BinaryIO, chunk_size=CHUNK_SIZE) -> Iterator[bytes]:
+    if isinstance(source, (Path, str)):
+        with open(source, 'rb') as f:
+            yield from read_chunks(f, chunk_size)
+        return
+    while chunk := source.read(chunk_size):
+        yield chunk
+
+
+def read_lines(source: Path | str | BinaryIO, chunk_size=CHUNK_SIZE) -> Iterator[str]:
+    tail = b''
+    for chunk in read_chunks(source, chunk_size):
+        lines = (tail + chunk).split(b'\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line.decode()
+    if tail:
+        yield tail.decode()